@@ -1,15 +1,50 @@
 import sys
 import os
 import re
-import markdown
+import functools
+import string
+import sqlite3
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from dotenv import load_dotenv
-from pypdf import PdfReader
-import docx  # For Word Files
 
-# --- AI Providers ---
-import google.generativeai as genai
-from openai import OpenAI
-from anthropic import Anthropic
+# NOTE: the AI SDKs, pypdf/pypdfium2, docx, tiktoken and pygments together
+# add 0.5-2s to cold startup, so they are imported lazily at first use —
+# only PyQt6 and the stdlib load up front.
+
+_encoder = None
+_encoder_missing = False
+
+def truncate_tokens(text, budget):
+    """Trim text to a token budget, keeping head + tail with an elision marker.
+
+    The tail matters: for code that's where the bug usually lives, for
+    lectures that's the summary. Falls back to a ~4 chars/token estimate
+    when tiktoken is not installed.
+    """
+    global _encoder, _encoder_missing
+    if _encoder is None and not _encoder_missing:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoder_missing = True
+
+    if _encoder is None:
+        limit = budget * 4
+        if len(text) <= limit:
+            return text
+        half = limit // 2
+        return text[:half] + "\n...[elided]...\n" + text[-half:]
+
+    toks = _encoder.encode(text)
+    if len(toks) <= budget:
+        return text
+    half = budget // 2
+    return _encoder.decode(toks[:half]) + "\n...[elided]...\n" + _encoder.decode(toks[-half:])
 
 # --- PyQt6 Imports ---
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
@@ -17,18 +52,22 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QPushButton, QLabel, QFileDialog, QMessageBox,
                              QTabWidget, QComboBox, QProgressBar, QDialog,
                              QFormLayout, QLineEdit, QDialogButtonBox, QGroupBox, QFrame, QStackedWidget)
-from PyQt6.QtCore import Qt, QDir, QThread, pyqtSignal, QSettings
+from PyQt6.QtCore import Qt, QDir, QObject, QThread, pyqtSignal, QSettings
 from PyQt6.QtGui import (QFileSystemModel, QFont, QColor, QSyntaxHighlighter,
-                         QTextCharFormat, QIcon, QPalette)
+                         QTextCharFormat, QTextDocument, QIcon, QPalette)
 from PyQt6.QtPrintSupport import QPrinter
 
-# --- Syntax Highlighting ---
-import pygments
-from pygments.lexers import get_lexer_by_name, guess_lexer_for_filename
-from pygments.formatter import Formatter
-
 load_dotenv()
 
+@functools.lru_cache(maxsize=128)
+def lexer_for_file(ext, first_line=""):
+    """Resolve a Pygments lexer without re-scanning the registry per tab."""
+    from pygments.lexers import get_lexer_by_name, guess_lexer_for_filename
+    try:
+        return guess_lexer_for_filename(f"x{ext}", first_line)
+    except Exception:
+        return get_lexer_by_name("text")
+
 # --- CONFIGURATION ---
 MODELS_CONFIG = {
     "Google: Gemini 2.5 Flash": {"provider": "gemini", "model_id": "gemini-2.5-flash"},
@@ -72,67 +111,85 @@ class ThemeManager:
         "btn_text": "#ffffff"
     }
 
-    @staticmethod
-    def get_sheet(theme_dict):
-        t = theme_dict
-        return f"""
-            QMainWindow {{ background-color: {t['bg_main']}; color: {t['text_main']}; }}
-            QWidget {{ font-family: 'Segoe UI', 'Helvetica Neue', sans-serif; font-size: 13px; color: {t['text_main']}; }}
+    # Compiled once; substitute() is a single C-level pass instead of
+    # re-evaluating ~30 f-string interpolations per build
+    _QSS_TEMPLATE = string.Template("""
+            QMainWindow { background-color: $bg_main; color: $text_main; }
+            QWidget { font-family: 'Segoe UI', 'Helvetica Neue', sans-serif; font-size: 13px; color: $text_main; }
 
             /* Splitter */
-            QSplitter::handle {{ background-color: {t['border']}; width: 1px; }}
+            QSplitter::handle { background-color: $border; width: 1px; }
 
             /* Panels */
-            QTreeView {{ background-color: {t['bg_sidebar']}; border: none; border-right: 1px solid {t['border']}; }}
-            QTreeView::item:hover {{ background-color: {t['accent']}33; }}
-            QTreeView::item:selected {{ background-color: {t['accent']}66; color: {t['text_main']}; }}
+            QTreeView { background-color: $bg_sidebar; border: none; border-right: 1px solid $border; }
+            QTreeView::item:hover { background-color: ${accent}33; }
+            QTreeView::item:selected { background-color: ${accent}66; color: $text_main; }
 
             /* Editor & Tabs */
-            QTabWidget::pane {{ border: 1px solid {t['border']}; border-top: none; }}
-            QTabBar::tab {{ background: {t['bg_sidebar']}; color: {t['text_muted']}; padding: 8px 15px; border-right: 1px solid {t['border']}; }}
-            QTabBar::tab:selected {{ background: {t['bg_editor']}; color: {t['accent']}; border-top: 2px solid {t['accent']}; font-weight: bold; }}
+            QTabWidget::pane { border: 1px solid $border; border-top: none; }
+            QTabBar::tab { background: $bg_sidebar; color: $text_muted; padding: 8px 15px; border-right: 1px solid $border; }
+            QTabBar::tab:selected { background: $bg_editor; color: $accent; border-top: 2px solid $accent; font-weight: bold; }
 
-            QPlainTextEdit, QTextEdit {{
-                background-color: {t['bg_editor']};
-                color: {t['text_main']};
+            QPlainTextEdit, QTextEdit {
+                background-color: $bg_editor;
+                color: $text_main;
                 border: none;
                 font-family: 'Consolas', monospace; font-size: 14px;
-            }}
+            }
 
             /* Inputs */
-            QLineEdit, QComboBox {{
-                background-color: {t['btn_bg']};
-                border: 1px solid {t['border']};
-                color: {t['text_main']};
+            QLineEdit, QComboBox {
+                background-color: $btn_bg;
+                border: 1px solid $border;
+                color: $text_main;
                 padding: 5px;
                 border-radius: 4px;
-            }}
+            }
 
             /* Buttons */
-            QPushButton {{
-                background-color: {t['btn_bg']};
-                border: 1px solid {t['border']};
-                color: {t['btn_text']};
+            QPushButton {
+                background-color: $btn_bg;
+                border: 1px solid $border;
+                color: $btn_text;
                 padding: 6px 12px;
                 border-radius: 4px;
                 font-weight: 500;
-            }}
-            QPushButton:hover {{ background-color: {t['accent']}22; border-color: {t['accent']}; }}
+            }
+            QPushButton:hover { background-color: ${accent}22; border-color: $accent; }
 
             /* Primary Action Button */
-            QPushButton#ActionBtn {{ background-color: {t['accent']}; color: white; border: none; font-weight: bold; }}
-            QPushButton#ActionBtn:hover {{ background-color: {t['accent_hover']}; }}
+            QPushButton#ActionBtn { background-color: $accent; color: white; border: none; font-weight: bold; }
+            QPushButton#ActionBtn:hover { background-color: $accent_hover; }
 
             /* SPU Special Button */
-            QPushButton#SPUBtn {{ background-color: {t['spu_color']}; color: white; border: none; font-weight: bold; }}
-            QPushButton#SPUBtn:hover {{ opacity: 0.8; }}
-        """
+            QPushButton#SPUBtn { background-color: $spu_color; color: white; border: none; font-weight: bold; }
+            QPushButton#SPUBtn:hover { opacity: 0.8; }
+        """)
+
+    @staticmethod
+    def get_sheet(theme_dict):
+        return ThemeManager._QSS_TEMPLATE.substitute(theme_dict)
+
+# Built once at import; setStyleSheet can then short-circuit on the
+# identical string instead of re-parsing a freshly interpolated sheet
+ThemeManager.LIGHT_SHEET = ThemeManager.get_sheet(ThemeManager.LIGHT)
+ThemeManager.DARK_SHEET = ThemeManager.get_sheet(ThemeManager.DARK)
 
 # --- WORKER ---
-class AIWorker(QThread):
-    finished = pyqtSignal(str)
+class _Cancelled(Exception):
+    """Raised inside AIWorker when a newer request superseded this one."""
+
+class AIWorker(QObject):
+    # Runs on the shared thread pool rather than a QThread per click;
+    # cross-thread signal emission is queued onto the GUI thread by Qt.
+    chunk = pyqtSignal(str)
+    finished = pyqtSignal(str, str)  # (markdown, html — empty when no renderer)
     error = pyqtSignal(str)
 
+    # Shared across runs so repeat requests reuse TLS connection pools.
+    # Keyed by api key too, so rotating a key in Settings gets a fresh client.
+    _clients = {}
+
     def __init__(self, mode, model_info, content, instruction, api_keys):
         super().__init__()
         self.mode = mode # "code" or "edu"
@@ -141,19 +198,20 @@ class AIWorker(QThread):
         self.content = content
         self.instruction = instruction
         self.api_keys = api_keys
+        self.cancelled = False
 
     def run(self):
         # Prompt Engineering based on Mode
         if self.mode == "code":
             sys_prompt = "You are an Expert Software Architect."
-            user_prompt = f"Instruction: {self.instruction}\n\nCode Context:\n{self.content[:20000]}"
+            user_prompt = f"Instruction: {self.instruction}\n\nCode Context:\n{truncate_tokens(self.content, 20_000)}"
         else: # mode == "edu"
             sys_prompt = "You are an Expert Professor and Tutor."
             user_prompt = f"""
             Instruction: {self.instruction}
 
             Source Material (Lecture/Notes):
-            {self.content[:30000]}
+            {truncate_tokens(self.content, 30_000)}
 
             Task: Explain clearly, summarize key points, or create a quiz as requested.
             Output: Markdown formatted.
@@ -162,26 +220,164 @@ class AIWorker(QThread):
         full_prompt = f"{sys_prompt}\n\n{user_prompt}"
 
         try:
-            response_text = ""
-            # ... (API Calls Logic - Standardized) ...
+            parts = []
+            # ... (API Calls Logic - Standardized, streaming) ...
             if self.provider == "gemini":
-                genai.configure(api_key=self.api_keys["gemini"])
-                model = genai.GenerativeModel(self.model_id)
-                response_text = model.generate_content(full_prompt).text
+                import google.generativeai as genai
+                cache_key = ("gemini", self.api_keys["gemini"], self.model_id)
+                model = self._clients.get(cache_key)
+                if model is None:
+                    genai.configure(api_key=self.api_keys["gemini"])
+                    model = self._clients.setdefault(cache_key, genai.GenerativeModel(self.model_id))
+                for piece in model.generate_content(full_prompt, stream=True):
+                    self._emit_chunk(piece.text, parts)
             elif self.provider in ["openai", "deepseek", "perplexity"]:
-                base_urls = {"openai": None, "deepseek": "https://api.deepseek.com", "perplexity": "https://api.perplexity.ai"}
-                client = OpenAI(api_key=self.api_keys[self.provider], base_url=base_urls[self.provider])
-                response_text = client.chat.completions.create(model=self.model_id, messages=[{"role": "user", "content": full_prompt}]).choices[0].message.content
+                from openai import OpenAI
+                cache_key = (self.provider, self.api_keys[self.provider])
+                client = self._clients.get(cache_key)
+                if client is None:
+                    base_urls = {"openai": None, "deepseek": "https://api.deepseek.com", "perplexity": "https://api.perplexity.ai"}
+                    client = self._clients.setdefault(cache_key, OpenAI(api_key=self.api_keys[self.provider], base_url=base_urls[self.provider]))
+                stream = client.chat.completions.create(model=self.model_id, messages=[{"role": "user", "content": full_prompt}], stream=True)
+                for ev in stream:
+                    self._emit_chunk(ev.choices[0].delta.content, parts)
             elif self.provider == "anthropic":
-                client = Anthropic(api_key=self.api_keys["anthropic"])
-                response_text = client.messages.create(model=self.model_id, max_tokens=4096, messages=[{"role": "user", "content": full_prompt}]).content[0].text
+                from anthropic import Anthropic
+                cache_key = ("anthropic", self.api_keys["anthropic"])
+                client = self._clients.get(cache_key)
+                if client is None:
+                    client = self._clients.setdefault(cache_key, Anthropic(api_key=self.api_keys["anthropic"]))
+                with client.messages.stream(model=self.model_id, max_tokens=4096, messages=[{"role": "user", "content": full_prompt}]) as stream:
+                    for text in stream.text_stream:
+                        self._emit_chunk(text, parts)
+
+            response_text = "".join(parts)
+            # Render markdown here so the main thread only has to setHtml —
+            # Qt's own markdown parser would otherwise stall the UI
+            try:
+                import cmarkgfm
+                html = cmarkgfm.github_flavored_markdown_to_html(response_text)
+            except ImportError:
+                html = ""
+            self.finished.emit(response_text, html)
+        except _Cancelled:
+            pass
+        except Exception as e:
+            if not self.cancelled:
+                self.error.emit(str(e))
+
+    def _emit_chunk(self, text, parts):
+        if self.cancelled:
+            raise _Cancelled
+        if text:
+            parts.append(text)
+            self.chunk.emit(text)
+
+# --- DOCUMENT EXTRACTION WORKER ---
+class ExtractWorker(QThread):
+    page_ready = pyqtSignal(str)
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    # Stop extracting once we have this much text; the AI prompt truncates
+    # far below it anyway, so pages past the cap would just be discarded
+    MAX_TEXT_CHARS = 30_000_000
+
+    def __init__(self, path, ext, stat=None):
+        super().__init__()
+        self.path = path
+        self.ext = ext
+        self.stat = stat
+        self.pages = []
+        self.cancelled = False
+        self.failed = False
+        self._emitted = 0
+
+    def cancel(self):
+        """Stop extracting; checked between pages"""
+        self.cancelled = True
+
+    def _emit_page(self, text):
+        if self.cancelled:
+            return False
+        self.pages.append(text)
+        self.page_ready.emit(text)
+        self._emitted += len(text)
+        return self._emitted < self.MAX_TEXT_CHARS
 
-            self.finished.emit(response_text)
+    def run(self):
+        try:
+            if self.ext == ".pdf":
+                try:
+                    import pypdfium2  # noqa: F401 — C-backed, much faster
+                except ImportError:
+                    from pypdf import PdfReader
+                    reader = PdfReader(self.path)
+                    for p in reader.pages:
+                        if not self._emit_page(p.extract_text() or ""):
+                            break
+                else:
+                    self._run_pdfium()
+            else:  # .docx
+                self._emit_page(self._extract_docx())
         except Exception as e:
+            self.failed = True
             self.error.emit(str(e))
+        self.finished.emit()
+
+    def _run_pdfium(self):
+        import pypdfium2 as pdfium
+        n_pages = len(pdfium.PdfDocument(self.path))
+        workers = min(os.cpu_count() or 1, max(1, n_pages // 8))
+
+        if workers == 1:
+            pdf = pdfium.PdfDocument(self.path)
+            for page in pdf:
+                if not self._emit_page(page.get_textpage().get_text_bounded()):
+                    return
+            return
+
+        # PDFium releases the GIL in C, so consecutive page ranges extract
+        # near-linearly across threads. pool.map preserves chunk order.
+        step = -(-n_pages // workers)
+        ranges = [(lo, min(lo + step, n_pages)) for lo in range(0, n_pages, step)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk in pool.map(self._extract_range, ranges):
+                if not self._emit_page(chunk):
+                    return
+
+    def _extract_range(self, bounds):
+        import pypdfium2 as pdfium
+        lo, hi = bounds
+        # Each worker opens its own handle; PdfDocument is not thread-safe
+        pdf = pdfium.PdfDocument(self.path)
+        return "\n".join(pdf[i].get_textpage().get_text_bounded() for i in range(lo, hi))
+
+    _W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+    def _extract_docx(self):
+        # Stream <w:t> runs straight out of the raw XML. python-docx builds
+        # the full object model (styles, relationships, numbering) just to
+        # read .text, which is 10-50x more work than we need here.
+        try:
+            parts = []
+            with zipfile.ZipFile(self.path) as z, z.open("word/document.xml") as f:
+                for _, elem in ET.iterparse(f):
+                    if elem.tag == f"{self._W_NS}t":
+                        parts.append(elem.text or "")
+                    elif elem.tag == f"{self._W_NS}p":
+                        parts.append("\n")
+                        elem.clear()  # keep memory flat on huge documents
+            return "".join(parts)
+        except Exception:
+            import docx
+            doc = docx.Document(self.path)
+            return "\n".join(p.text for p in doc.paragraphs)
 
 # --- MAIN APP ---
 class TunnerSuite(QMainWindow):
+    MAX_EDITOR_BYTES = 1_000_000  # Truncate source files beyond this
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SPU AI CLUB: Tunner Suite (Ultimate Edition)")
@@ -190,6 +386,22 @@ class TunnerSuite(QMainWindow):
         self.current_theme = "dark" # Default
         self.current_mode = "code"  # code | edu
 
+        # Persistent extraction cache keyed by (path, mtime_ns, size)
+        self._doc_cache_path = Path.home() / ".tunner_cache" / "docs.sqlite"
+        self._doc_cache_conn = None
+
+        # API keys, read once; invalidated when Settings saves
+        self._keys_cache = None
+
+        # Shared pool for AI calls — no OS thread spawn per click
+        self._ai_pool = ThreadPoolExecutor(max_workers=2)
+        self.worker = None
+
+        # Current extraction, plus superseded workers parked until their
+        # threads exit (destroying a running QThread aborts the process)
+        self.extract_worker = None
+        self._stale_extracts = []
+
         self.init_ui()
         self.apply_theme()
 
@@ -226,7 +438,8 @@ class TunnerSuite(QMainWindow):
 
         # Model Selector
         self.model_box = QComboBox()
-        self.model_box.addItems(list(MODELS_CONFIG.keys()))
+        for label, cfg in MODELS_CONFIG.items():
+            self.model_box.addItem(label, userData=cfg)
 
         btn_keys = QPushButton("🔑 Keys")
         btn_keys.clicked.connect(self.open_settings)
@@ -291,6 +504,11 @@ class TunnerSuite(QMainWindow):
         layout.addWidget(btn_open)
 
         self.file_model = QFileSystemModel()
+        # No file watchers or custom dir icons — both cost stat()/inotify
+        # traffic on big trees, and the explorer is read-mostly anyway
+        self.file_model.setOption(QFileSystemModel.Option.DontWatchForChanges, True)
+        self.file_model.setOption(QFileSystemModel.Option.DontUseCustomDirectoryIcons, True)
+        self.file_model.setFilter(QDir.Filter.Files | QDir.Filter.Dirs | QDir.Filter.NoDotAndDotDot)
         self.file_model.setRootPath("")
         self.tree = QTreeView()
         self.tree.setModel(self.file_model)
@@ -333,12 +551,14 @@ class TunnerSuite(QMainWindow):
     def apply_theme(self):
         if self.current_theme == "dark":
             t = ThemeManager.DARK
+            sheet = ThemeManager.DARK_SHEET
             self.btn_theme.setText("☀️")
         else:
             t = ThemeManager.LIGHT
+            sheet = ThemeManager.LIGHT_SHEET
             self.btn_theme.setText("🌙")
 
-        self.setStyleSheet(ThemeManager.get_sheet(t))
+        self.setStyleSheet(sheet)
 
         # Dynamic Colors
         self.lbl_brand.setStyleSheet(f"color: {t['spu_color']}; font-weight: 900; font-size: 16px;")
@@ -371,24 +591,103 @@ class TunnerSuite(QMainWindow):
         ext = os.path.splitext(path)[1].lower()
 
         # Content Extraction
-        content = ""
         try:
-            if ext == ".pdf":
-                reader = PdfReader(path)
-                content = "\n".join([p.extract_text() for p in reader.pages])
-                self.load_to_viewer(path, content, is_doc=True)
-            elif ext == ".docx":
-                doc = docx.Document(path)
-                content = "\n".join([p.text for p in doc.paragraphs])
-                self.load_to_viewer(path, content, is_doc=True)
+            if ext in (".pdf", ".docx"):
+                self.open_document(path, ext)
             else:
-                # Code / Text
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                # Code / Text — cap what we hand the editor so a stray
+                # multi-MB log doesn't stall the UI
+                size = os.path.getsize(path)
+                with open(path, 'rb') as f:
+                    content = f.read(self.MAX_EDITOR_BYTES).decode('utf-8', 'ignore')
+                if size > self.MAX_EDITOR_BYTES:
+                    content += f"\n\n--- TRUNCATED ({size:,} bytes total, first {self.MAX_EDITOR_BYTES:,} shown) ---"
                 self.load_to_viewer(path, content, is_doc=False)
         except Exception as e:
             self.status.showMessage(f"Error reading file: {e}")
 
+    def open_document(self, path, ext):
+        # Extract off the GUI thread, streaming pages in as they arrive
+        filename = os.path.basename(path)
+        self.switch_mode("edu")
+
+        st = os.stat(path)
+        cached = self._doc_cache_get(path, st)
+        if cached is not None:
+            self.doc_viewer.setPlainText(f"--- DOCUMENT: {filename} ---\n\n{cached}")
+            return
+
+        self.doc_viewer.setPlainText(f"--- DOCUMENT: {filename} ---\n")
+
+        self.progress.setVisible(True)
+        self.progress.setRange(0, 0)
+
+        # Supersede any extraction still running: mute its signals so
+        # stale pages can't interleave into this document's view, and
+        # park the worker until its thread exits
+        old = self.extract_worker
+        if old is not None and old.isRunning():
+            old.cancel()
+            old.page_ready.disconnect()
+            old.error.disconnect()
+            old.finished.disconnect()
+            self._stale_extracts.append(old)
+            old.finished.connect(lambda w=old: self._stale_extracts.remove(w))
+
+        self.extract_worker = ExtractWorker(path, ext, st)
+        self.extract_worker.page_ready.connect(self.doc_viewer.append)
+        self.extract_worker.error.connect(lambda e: self.status.showMessage(f"Error reading file: {e}"))
+        self.extract_worker.finished.connect(self.on_extract_finished)
+        self.extract_worker.start()
+
+    def on_extract_finished(self):
+        # Only the current worker is still connected here; superseded
+        # ones were disconnected when their replacement started
+        worker = self.extract_worker
+        self.progress.setVisible(False)
+        text = "\n".join(worker.pages)
+
+        # Never cache a failed run: the partial (or empty) text would be
+        # served silently on every later open of the same file
+        if not worker.failed:
+            try:
+                self._doc_cache_put(worker.path, worker.stat, text)
+            except Exception:
+                pass  # Cache is best-effort; extraction already succeeded
+
+        if worker.ext == ".pdf" and len(text.strip()) < 20:
+            self.status.showMessage("No text layer found — PDF looks scanned. Run OCR (e.g. Tesseract) first.")
+
+    def _doc_cache(self):
+        if self._doc_cache_conn is None:
+            self._doc_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._doc_cache_conn = sqlite3.connect(str(self._doc_cache_path))
+            self._doc_cache_conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "path TEXT, mtime INTEGER, size INTEGER, text BLOB, "
+                "PRIMARY KEY (path, mtime, size))"
+            )
+        return self._doc_cache_conn
+
+    def _doc_cache_get(self, path, st):
+        try:
+            row = self._doc_cache().execute(
+                "SELECT text FROM cache WHERE path=? AND mtime=? AND size=?",
+                (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+            ).fetchone()
+        except Exception:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def _doc_cache_put(self, path, st, text):
+        conn = self._doc_cache()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (path, mtime, size, text) VALUES (?, ?, ?, ?)",
+            (os.path.abspath(path), st.st_mtime_ns, st.st_size,
+             zlib.compress(text.encode('utf-8')))
+        )
+        conn.commit()
+
     def load_to_viewer(self, path, content, is_doc):
         filename = os.path.basename(path)
 
@@ -410,7 +709,10 @@ class TunnerSuite(QMainWindow):
         editor = QPlainTextEdit()
         editor.setPlainText(content)
         editor.setFont(QFont("Consolas", 12))
-        # (Add Syntax Highlighter here same as previous version)
+        if path:
+            # Cached lookup; a highlighter can pick this up from the editor
+            ext = os.path.splitext(path)[1].lower()
+            editor.lexer = lexer_for_file(ext, content.split("\n", 1)[0][:256])
         self.code_tabs.addTab(editor, title)
         if path:
             self.code_tabs.setTabToolTip(self.code_tabs.count()-1, path)
@@ -427,7 +729,7 @@ class TunnerSuite(QMainWindow):
             QMessageBox.warning(self, "Empty", "Please select a file first.")
             return
 
-        model_info = MODELS_CONFIG[self.model_box.currentText()]
+        model_info = self.model_box.currentData()
         keys = self.get_keys()
 
         if not keys.get(model_info["provider"]):
@@ -439,16 +741,33 @@ class TunnerSuite(QMainWindow):
         self.btn_run.setEnabled(False)
         self.status.showMessage(f"AI Working in {self.current_mode.upper()} mode...")
 
+        if self.worker is not None:
+            # Cancel and disconnect the stale worker: the flag stops new
+            # emissions, but chunks/finished already queued across the
+            # thread boundary would still land in the cleared output
+            self.worker.cancelled = True
+            try:
+                self.worker.chunk.disconnect()
+                self.worker.finished.disconnect()
+                self.worker.error.disconnect()
+            except TypeError:
+                pass  # already fully delivered and disconnected
+
+        self.ai_output.clear()
         self.worker = AIWorker(self.current_mode, model_info, content, instruction, keys)
+        self.worker.chunk.connect(self.ai_output.insertPlainText)
         self.worker.finished.connect(self.on_ai_finished)
         self.worker.error.connect(lambda e: QMessageBox.critical(self, "Error", e))
-        self.worker.start()
+        self._ai_pool.submit(self.worker.run)
 
-    def on_ai_finished(self, text):
+    def on_ai_finished(self, text, html):
         self.progress.setVisible(False)
         self.btn_run.setEnabled(True)
         self.status.showMessage("Done.")
-        self.ai_output.setMarkdown(text)
+        if html:
+            self.ai_output.setHtml(html)
+        else:
+            self.ai_output.setMarkdown(text)
 
     def export_pdf(self):
         path, _ = QFileDialog.getSaveFileName(self, "Export PDF", "TunnerReport.pdf", "PDF (*.pdf)")
@@ -457,19 +776,26 @@ class TunnerSuite(QMainWindow):
             printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
             printer.setOutputFileName(path)
 
-            html = markdown.markdown(self.ai_output.toMarkdown(), extensions=['fenced_code', 'tables'])
-            doc = QTextEdit()
-            doc.setHtml(f"<html><body><h1>SPU Tunner Report</h1>{html}</body></html>")
+            # A bare QTextDocument prints fine — no need for a throwaway
+            # QTextEdit widget or a markdown->HTML round-trip
+            doc = QTextDocument()
+            doc.setMarkdown(f"# SPU Tunner Report\n\n{self.ai_output.toMarkdown()}")
             doc.print(printer)
             QMessageBox.information(self, "Saved", f"Saved to {path}")
 
     def get_keys(self):
+        # QSettings.value hits the backing store (registry/plist) per call,
+        # so read all providers once and serve from memory afterwards
+        if self._keys_cache is not None:
+            return self._keys_cache
+
         s = QSettings("SPU", "Ultimate")
         k = {}
         for p in ["gemini", "openai", "anthropic", "deepseek", "perplexity"]:
             v = s.value(f"{p}_key", "")
             if not v: v = os.getenv(f"{p.upper()}_API_KEY")
             k[p] = v
+        self._keys_cache = k
         return k
 
     def open_settings(self):
@@ -485,7 +811,18 @@ class TunnerSuite(QMainWindow):
             l.addRow(f"{k.capitalize()}:", le)
             inputs[k] = le
         bb = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel)
-        bb.accepted.connect(lambda: [s.setValue(f"{k}_key", v.text()) for k,v in inputs.items()] or dlg.accept())
+
+        def save():
+            # Only touch keys that actually changed, then flush once —
+            # each QSettings write can hit the registry/plist separately
+            for k, v in inputs.items():
+                if v.text() != s.value(f"{k}_key", ""):
+                    s.setValue(f"{k}_key", v.text())
+            s.sync()
+            self._keys_cache = None
+            dlg.accept()
+
+        bb.accepted.connect(save)
         bb.rejected.connect(dlg.reject)
         l.addWidget(bb)
         dlg.exec()
@@ -1,11 +1,18 @@
 import sys
 import os
 import re
+import hashlib
+import heapq
 import json
-import subprocess
+import mmap
+import string
+from bisect import bisect_left
+from collections import ChainMap, namedtuple
+import functools
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
 
@@ -22,7 +29,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import (
     Qt, QDir, QThread, pyqtSignal, QSettings, QSize, QTimer,
     QPropertyAnimation, QEasingCurve, QPoint, QMimeData, QUrl, QProcess,
-    QStringListModel, QRect, QObject
+    QStringListModel, QRect, QObject, QAbstractListModel, QModelIndex,
+    QRegularExpression
 )
 from PyQt6.QtGui import (
     QFileSystemModel, QFont, QColor, QSyntaxHighlighter, QTextCharFormat,
@@ -40,6 +48,7 @@ from anthropic import Anthropic
 # --- Syntax Highlighting ---
 import pygments
 from pygments import lexers, styles, token
+from pygments.lexer import RegexLexer, ExtendedRegexLexer
 
 load_dotenv()
 
@@ -47,163 +56,265 @@ load_dotenv()
 # 1. THEME MANAGER WITH CUSTOM THEMES
 # ==========================================
 
+# Theme palettes are namedtuples rather than dicts: attribute access is
+# C-coded and faster than string-keyed lookups in the hot stylesheet and
+# highlighter paths, and the fixed field set doubles as the schema for
+# QSettings round-trips.
+ThemeTuple = namedtuple("ThemeTuple", (
+    "name bg_main bg_sidebar bg_toolbar bg_editor bg_preview "
+    "fg_text fg_sub fg_comment accent accent_hover border selection "
+    "line_number current_line success error warning keyword string "
+    "function variable pygment"
+))
+
+
 class ThemeManager:
     """Advanced theme manager with custom theme editor"""
 
-    DEFAULT_THEMES = {
-        "Xcode Dark": {
-            "name": "Xcode Dark",
-            "bg_main": "#1f1f24",
-            "bg_sidebar": "#292a30",
-            "bg_toolbar": "#3a3a3f",
-            "bg_editor": "#1f1f24",
-            "bg_preview": "#2d2d32",
-            "fg_text": "#ffffff",
-            "fg_sub": "#8e8e93",
-            "fg_comment": "#6c7986",
-            "accent": "#0a84ff",
-            "accent_hover": "#0070e0",
-            "border": "#3a3a3f",
-            "selection": "#0a84ff",
-            "line_number": "#6e6e73",
-            "current_line": "#2d2d32",
-            "success": "#30d158",
-            "error": "#ff453a",
-            "warning": "#ffd60a",
-            "keyword": "#fc5fa3",
-            "string": "#fc6a5d",
-            "function": "#67b7a4",
-            "variable": "#acf2e4",
-            "pygment": "monokai"
-        },
-        "Xcode Light": {
-            "name": "Xcode Light",
-            "bg_main": "#ffffff",
-            "bg_sidebar": "#f5f5f7",
-            "bg_toolbar": "#ececec",
-            "bg_editor": "#ffffff",
-            "bg_preview": "#f5f5f7",
-            "fg_text": "#1d1d1f",
-            "fg_sub": "#86868b",
-            "fg_comment": "#707f8c",
-            "accent": "#007aff",
-            "accent_hover": "#0051d5",
-            "border": "#d2d2d7",
-            "selection": "#b3d7ff",
-            "line_number": "#86868b",
-            "current_line": "#f0f0f0",
-            "success": "#34c759",
-            "error": "#ff3b30",
-            "warning": "#ff9500",
-            "keyword": "#ad3da4",
-            "string": "#d12f1b",
-            "function": "#3e8087",
-            "variable": "#0f68a0",
-            "pygment": "xcode"
-        },
-        "GitHub Dark": {
-            "name": "GitHub Dark",
-            "bg_main": "#0d1117",
-            "bg_sidebar": "#161b22",
-            "bg_toolbar": "#21262d",
-            "bg_editor": "#0d1117",
-            "bg_preview": "#161b22",
-            "fg_text": "#c9d1d9",
-            "fg_sub": "#8b949e",
-            "fg_comment": "#8b949e",
-            "accent": "#58a6ff",
-            "accent_hover": "#388bfd",
-            "border": "#30363d",
-            "selection": "#58a6ff",
-            "line_number": "#6e7681",
-            "current_line": "#161b22",
-            "success": "#3fb950",
-            "error": "#f85149",
-            "warning": "#d29922",
-            "keyword": "#ff7b72",
-            "string": "#a5d6ff",
-            "function": "#d2a8ff",
-            "variable": "#ffa657",
-            "pygment": "monokai"
-        },
-        "Dracula": {
-            "name": "Dracula",
-            "bg_main": "#282a36",
-            "bg_sidebar": "#21222c",
-            "bg_toolbar": "#343746",
-            "bg_editor": "#282a36",
-            "bg_preview": "#21222c",
-            "fg_text": "#f8f8f2",
-            "fg_sub": "#6272a4",
-            "fg_comment": "#6272a4",
-            "accent": "#bd93f9",
-            "accent_hover": "#9580d4",
-            "border": "#44475a",
-            "selection": "#44475a",
-            "line_number": "#6272a4",
-            "current_line": "#44475a",
-            "success": "#50fa7b",
-            "error": "#ff5555",
-            "warning": "#ffb86c",
-            "keyword": "#ff79c6",
-            "string": "#f1fa8c",
-            "function": "#8be9fd",
-            "variable": "#50fa7b",
-            "pygment": "dracula"
+    # Built on first access rather than at import: four ~22-field
+    # literals are pure startup cost until a theme is actually applied,
+    # which happens after the window is already on screen.
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _defaults():
+        """Default theme palettes, keyed by display name"""
+        themes = {
+            "Xcode Dark": ThemeTuple(
+                name="Xcode Dark",
+                bg_main="#1f1f24",
+                bg_sidebar="#292a30",
+                bg_toolbar="#3a3a3f",
+                bg_editor="#1f1f24",
+                bg_preview="#2d2d32",
+                fg_text="#ffffff",
+                fg_sub="#8e8e93",
+                fg_comment="#6c7986",
+                accent="#0a84ff",
+                accent_hover="#0070e0",
+                border="#3a3a3f",
+                selection="#0a84ff",
+                line_number="#6e6e73",
+                current_line="#2d2d32",
+                success="#30d158",
+                error="#ff453a",
+                warning="#ffd60a",
+                keyword="#fc5fa3",
+                string="#fc6a5d",
+                function="#67b7a4",
+                variable="#acf2e4",
+                pygment="monokai"
+            ),
+            "Xcode Light": ThemeTuple(
+                name="Xcode Light",
+                bg_main="#ffffff",
+                bg_sidebar="#f5f5f7",
+                bg_toolbar="#ececec",
+                bg_editor="#ffffff",
+                bg_preview="#f5f5f7",
+                fg_text="#1d1d1f",
+                fg_sub="#86868b",
+                fg_comment="#707f8c",
+                accent="#007aff",
+                accent_hover="#0051d5",
+                border="#d2d2d7",
+                selection="#b3d7ff",
+                line_number="#86868b",
+                current_line="#f0f0f0",
+                success="#34c759",
+                error="#ff3b30",
+                warning="#ff9500",
+                keyword="#ad3da4",
+                string="#d12f1b",
+                function="#3e8087",
+                variable="#0f68a0",
+                pygment="xcode"
+            ),
+            "GitHub Dark": ThemeTuple(
+                name="GitHub Dark",
+                bg_main="#0d1117",
+                bg_sidebar="#161b22",
+                bg_toolbar="#21262d",
+                bg_editor="#0d1117",
+                bg_preview="#161b22",
+                fg_text="#c9d1d9",
+                fg_sub="#8b949e",
+                fg_comment="#8b949e",
+                accent="#58a6ff",
+                accent_hover="#388bfd",
+                border="#30363d",
+                selection="#58a6ff",
+                line_number="#6e7681",
+                current_line="#161b22",
+                success="#3fb950",
+                error="#f85149",
+                warning="#d29922",
+                keyword="#ff7b72",
+                string="#a5d6ff",
+                function="#d2a8ff",
+                variable="#ffa657",
+                pygment="monokai"
+            ),
+            "Dracula": ThemeTuple(
+                name="Dracula",
+                bg_main="#282a36",
+                bg_sidebar="#21222c",
+                bg_toolbar="#343746",
+                bg_editor="#282a36",
+                bg_preview="#21222c",
+                fg_text="#f8f8f2",
+                fg_sub="#6272a4",
+                fg_comment="#6272a4",
+                accent="#bd93f9",
+                accent_hover="#9580d4",
+                border="#44475a",
+                selection="#44475a",
+                line_number="#6272a4",
+                current_line="#44475a",
+                success="#50fa7b",
+                error="#ff5555",
+                warning="#ffb86c",
+                keyword="#ff79c6",
+                string="#f1fa8c",
+                function="#8be9fd",
+                variable="#50fa7b",
+                pygment="dracula"
+            )
         }
-    }
+        return {name: ThemeManager._intern(t) for name, t in themes.items()}
+
+    @staticmethod
+    def _intern(theme):
+        """Intern a theme's strings so equal colors share one object"""
+        # Themes repeat short hex literals; interning collapses the
+        # duplicates and lets later dict hashing short-circuit on identity
+        return ThemeTuple._make(
+            sys.intern(v) if isinstance(v, str) else v for v in theme
+        )
+
+    # Custom themes, read from QSettings once and kept in memory.
+    # _group_saved tracks which names exist under the current per-theme
+    # group layout — only those may take the diffed (partial) save path;
+    # legacy-array themes must be written out in full first.
+    _custom_cache = None
+    _group_saved = set()
 
     @staticmethod
     def load_custom_themes():
-        """Load custom themes from settings"""
+        """Load custom themes from settings (cached after first read)"""
+        if ThemeManager._custom_cache is not None:
+            return ThemeManager._custom_cache
+
         settings = QSettings("GenAI_Studio", "CustomThemes")
         custom_themes = {}
+        theme_keys = ThemeTuple._fields
 
+        # Legacy array layout (older builds rewrote the whole array per save)
         theme_count = settings.beginReadArray("themes")
         for i in range(theme_count):
             settings.setArrayIndex(i)
             theme_name = settings.value("name")
             if theme_name:
-                custom_themes[theme_name] = {
+                custom_themes[theme_name] = ThemeManager._intern(ThemeTuple(**{
                     key: settings.value(key, "#000000")
-                    for key in ThemeManager.DEFAULT_THEMES["Xcode Dark"].keys()
-                }
+                    for key in theme_keys
+                }))
         settings.endArray()
 
+        # Current per-theme group layout
+        settings.beginGroup("custom")
+        ThemeManager._group_saved = set(settings.childGroups())
+        for theme_name in ThemeManager._group_saved:
+            settings.beginGroup(theme_name)
+            custom_themes[theme_name] = ThemeManager._intern(ThemeTuple(**{
+                key: settings.value(key, "#000000")
+                for key in theme_keys
+            }))
+            settings.endGroup()
+        settings.endGroup()
+
+        ThemeManager._custom_cache = custom_themes
         return custom_themes
 
     @staticmethod
     def save_custom_theme(theme_name, theme_data):
         """Save custom theme"""
+        # Update the in-memory cache and persist only this theme's keys —
+        # the old path reloaded and rewrote the entire array per save
+        old = ThemeManager.load_custom_themes().get(theme_name)
+        ThemeManager.load_custom_themes()[theme_name] = ThemeManager._intern(
+            ThemeTuple(**theme_data))
+
+        # The diff below is only valid against values already persisted
+        # under the group layout; a theme that so far exists only in the
+        # legacy array (or not at all) must be written out in full, or
+        # the skipped keys come back as the "#000000" default on restart
+        diff_ok = theme_name in ThemeManager._group_saved
+
         settings = QSettings("GenAI_Studio", "CustomThemes")
+        settings.beginGroup(f"custom/{theme_name}")
+        for key, value in theme_data.items():
+            # QSettings doesn't short-circuit identical writes itself;
+            # a typical edit touches one color out of ~22 keys
+            if not diff_ok or old is None or getattr(old, key, None) != value:
+                settings.setValue(key, value)
+        settings.endGroup()
+        ThemeManager._group_saved.add(theme_name)
 
-        # Load existing themes
-        all_themes = ThemeManager.load_custom_themes()
-        all_themes[theme_name] = theme_data
+        # Coalesce bursty saves into one flush on the next event-loop turn
+        QTimer.singleShot(0, settings.sync)
 
-        # Save back
-        settings.beginWriteArray("themes")
-        for i, (name, data) in enumerate(all_themes.items()):
-            settings.setArrayIndex(i)
-            settings.setValue("name", name)
-            for key, value in data.items():
-                settings.setValue(key, value)
-        settings.endArray()
+        # Invalidate the version-stamped caches
+        ThemeManager.invalidate()
+
+    # Version-stamped stylesheet cache: bumped via invalidate() so stale
+    # stylesheets are rebuilt exactly once
+    _cache_version = 0
+    _css_cache = {}
+
+    # The merged view, built once: ChainMap reads the cached custom dict
+    # live, so saves show through it without rebuilding
+    _all_view = None
 
     @staticmethod
     def get_all_themes():
         """Get all themes (default + custom)"""
-        themes = dict(ThemeManager.DEFAULT_THEMES)
-        themes.update(ThemeManager.load_custom_themes())
-        return themes
+        view = ThemeManager._all_view
+        if view is None:
+            view = ChainMap(ThemeManager.load_custom_themes(),
+                            ThemeManager._defaults())
+            ThemeManager._all_view = view
+        return view
 
     @staticmethod
-    def get_stylesheet(theme_name):
-        """Generate stylesheet from theme"""
-        all_themes = ThemeManager.get_all_themes()
-        t = all_themes.get(theme_name, ThemeManager.DEFAULT_THEMES["Xcode Dark"])
+    def invalidate():
+        """Force derived caches (stylesheets) to rebuild"""
+        ThemeManager._cache_version += 1
+
+    # Compiled lazily into alternating (literal, theme-key) fragments; the
+    # first build pays the parse, after which rendering is one str.join
+    # with no format-state machine or intermediate strings
+    _CSS_PARTS = None
 
-        css = f"""
+    @staticmethod
+    def _render_css(t):
+        parts = ThemeManager._CSS_PARTS
+        if parts is None:
+            parts = [
+                (literal, field)
+                for literal, field, _spec, _conv
+                in string.Formatter().parse(ThemeManager._CSS_TEMPLATE)
+            ]
+            ThemeManager._CSS_PARTS = parts
+
+        out = []
+        for literal, field in parts:
+            out.append(literal)
+            if field is not None:
+                out.append(getattr(t, field))
+        return "".join(out)
+
+    # Template source for _render_css, written with format-style fields
+    _CSS_TEMPLATE = """
             /* Global */
             * {{
                 font-family: -apple-system, "SF Mono", "Menlo", monospace;
@@ -211,41 +322,41 @@ class ThemeManager:
             }}
 
             QMainWindow {{
-                background-color: {t['bg_main']};
+                background-color: {bg_main};
             }}
 
             /* Toolbar */
             QToolBar {{
-                background-color: {t['bg_toolbar']};
+                background-color: {bg_toolbar};
                 border: none;
-                border-bottom: 1px solid {t['border']};
+                border-bottom: 1px solid {border};
                 spacing: 8px;
                 padding: 4px 12px;
             }}
 
             QToolBar QLabel {{
-                color: {t['fg_text']};
+                color: {fg_text};
                 font-weight: 600;
                 padding: 0 8px;
             }}
 
             QToolBar QPushButton {{
                 background-color: transparent;
-                color: {t['fg_text']};
-                border: 1px solid {t['border']};
+                color: {fg_text};
+                border: 1px solid {border};
                 padding: 6px 16px;
                 border-radius: 6px;
                 font-weight: 500;
             }}
 
             QToolBar QPushButton:hover {{
-                background-color: {t['accent']};
+                background-color: {accent};
                 color: white;
-                border-color: {t['accent']};
+                border-color: {accent};
             }}
 
             QToolBar QPushButton#PlayButton {{
-                background-color: {t['accent']};
+                background-color: {accent};
                 color: white;
                 border: none;
                 padding: 6px 20px;
@@ -253,21 +364,21 @@ class ThemeManager:
             }}
 
             QToolBar QPushButton#PlayButton:hover {{
-                background-color: {t['accent_hover']};
+                background-color: {accent_hover};
             }}
 
             /* Sidebar */
             #NavigatorPane {{
-                background-color: {t['bg_sidebar']};
-                border-right: 1px solid {t['border']};
+                background-color: {bg_sidebar};
+                border-right: 1px solid {border};
             }}
 
             QTreeView {{
-                background-color: {t['bg_sidebar']};
+                background-color: {bg_sidebar};
                 border: none;
                 outline: none;
                 padding: 8px;
-                color: {t['fg_text']};
+                color: {fg_text};
             }}
 
             QTreeView::item {{
@@ -277,77 +388,77 @@ class ThemeManager:
             }}
 
             QTreeView::item:selected {{
-                background-color: {t['selection']};
+                background-color: {selection};
                 color: white;
             }}
 
             QTreeView::item:hover {{
-                background-color: {t['selection']}33;
+                background-color: {selection}33;
             }}
 
             /* Editor */
             #EditorPane {{
-                background-color: {t['bg_editor']};
+                background-color: {bg_editor};
             }}
 
             QPlainTextEdit, QTextEdit {{
-                background-color: {t['bg_editor']};
-                color: {t['fg_text']};
+                background-color: {bg_editor};
+                color: {fg_text};
                 border: none;
                 padding: 8px;
                 font-family: "SF Mono", "Menlo", monospace;
                 font-size: 13px;
                 line-height: 1.5;
-                selection-background-color: {t['selection']};
+                selection-background-color: {selection};
                 selection-color: white;
             }}
 
             /* Line Number Area */
             #LineNumberArea {{
-                background-color: {t['bg_sidebar']};
-                color: {t['line_number']};
-                border-right: 1px solid {t['border']};
+                background-color: {bg_sidebar};
+                color: {line_number};
+                border-right: 1px solid {border};
             }}
 
             /* Preview Pane */
             #PreviewPane {{
-                background-color: {t['bg_preview']};
-                border-left: 1px solid {t['border']};
+                background-color: {bg_preview};
+                border-left: 1px solid {border};
             }}
 
             #PreviewControls {{
-                background-color: {t['bg_toolbar']};
-                border-bottom: 1px solid {t['border']};
+                background-color: {bg_toolbar};
+                border-bottom: 1px solid {border};
                 padding: 8px 12px;
             }}
 
             /* Git Panel */
             #GitPanel {{
-                background-color: {t['bg_sidebar']};
-                border-left: 1px solid {t['border']};
+                background-color: {bg_sidebar};
+                border-left: 1px solid {border};
             }}
 
             /* Debug Console */
             #DebugConsole {{
-                background-color: {t['bg_editor']};
-                color: {t['fg_text']};
-                border-top: 1px solid {t['border']};
+                background-color: {bg_editor};
+                color: {fg_text};
+                border-top: 1px solid {border};
                 font-family: "SF Mono", monospace;
                 font-size: 12px;
             }}
 
             /* Controls */
             QComboBox {{
-                background-color: {t['bg_toolbar']};
-                border: 1px solid {t['border']};
+                background-color: {bg_toolbar};
+                border: 1px solid {border};
                 border-radius: 6px;
                 padding: 6px 12px;
-                color: {t['fg_text']};
+                color: {fg_text};
                 min-width: 120px;
             }}
 
             QComboBox:hover {{
-                border-color: {t['accent']};
+                border-color: {accent};
             }}
 
             QComboBox::drop-down {{
@@ -356,33 +467,33 @@ class ThemeManager:
             }}
 
             QComboBox QAbstractItemView {{
-                background-color: {t['bg_toolbar']};
-                border: 1px solid {t['border']};
+                background-color: {bg_toolbar};
+                border: 1px solid {border};
                 border-radius: 8px;
                 padding: 4px;
-                selection-background-color: {t['accent']};
+                selection-background-color: {accent};
                 selection-color: white;
             }}
 
             QLineEdit {{
-                background-color: {t['bg_toolbar']};
-                border: 1px solid {t['border']};
+                background-color: {bg_toolbar};
+                border: 1px solid {border};
                 border-radius: 6px;
                 padding: 6px 12px;
-                color: {t['fg_text']};
+                color: {fg_text};
             }}
 
             QLineEdit:focus {{
-                border-color: {t['accent']};
+                border-color: {accent};
             }}
 
             /* List Widgets */
             QListWidget {{
-                background-color: {t['bg_sidebar']};
+                background-color: {bg_sidebar};
                 border: none;
                 outline: none;
                 padding: 4px;
-                color: {t['fg_text']};
+                color: {fg_text};
             }}
 
             QListWidget::item {{
@@ -392,25 +503,25 @@ class ThemeManager:
             }}
 
             QListWidget::item:selected {{
-                background-color: {t['selection']};
+                background-color: {selection};
                 color: white;
             }}
 
             QListWidget::item:hover {{
-                background-color: {t['selection']}33;
+                background-color: {selection}33;
             }}
 
             /* Status Bar */
             QStatusBar {{
-                background-color: {t['bg_toolbar']};
-                border-top: 1px solid {t['border']};
-                color: {t['fg_sub']};
+                background-color: {bg_toolbar};
+                border-top: 1px solid {border};
+                color: {fg_sub};
                 font-size: 11px;
             }}
 
             /* Splitter */
             QSplitter::handle {{
-                background-color: {t['border']};
+                background-color: {border};
                 width: 1px;
             }}
 
@@ -422,14 +533,14 @@ class ThemeManager:
             }}
 
             QScrollBar::handle:vertical {{
-                background: {t['fg_sub']};
+                background: {fg_sub};
                 min-height: 30px;
                 border-radius: 5px;
                 margin: 2px;
             }}
 
             QScrollBar::handle:vertical:hover {{
-                background: {t['border']};
+                background: {border};
             }}
 
             QScrollBar::add-line:vertical,
@@ -440,12 +551,12 @@ class ThemeManager:
             /* Tabs */
             QTabWidget::pane {{
                 border: none;
-                border-top: 1px solid {t['border']};
+                border-top: 1px solid {border};
             }}
 
             QTabBar::tab {{
-                background: {t['bg_toolbar']};
-                color: {t['fg_sub']};
+                background: {bg_toolbar};
+                color: {fg_sub};
                 padding: 10px 20px;
                 border-top-left-radius: 8px;
                 border-top-right-radius: 8px;
@@ -453,18 +564,40 @@ class ThemeManager:
             }}
 
             QTabBar::tab:selected {{
-                background: {t['bg_editor']};
-                color: {t['fg_text']};
+                background: {bg_editor};
+                color: {fg_text};
                 font-weight: 600;
-                border-top: 2px solid {t['accent']};
+                border-top: 2px solid {accent};
             }}
 
             QTabBar::tab:hover {{
-                background: {t['selection']}33;
+                background: {selection}33;
             }}
         """
 
-        return css, t
+    # Last-applied sentinel: callers tend to request the active theme
+    # over and over (focus changes, resizes), so the common case is a
+    # single tuple compare before even touching the dict cache
+    _last_key = None
+    _last_result = None
+
+    @staticmethod
+    def get_stylesheet(theme_name):
+        """Generate stylesheet from theme"""
+        key = (theme_name, ThemeManager._cache_version)
+        if key == ThemeManager._last_key:
+            return ThemeManager._last_result
+
+        cached = ThemeManager._css_cache.get(key)
+        if cached is None:
+            all_themes = ThemeManager.get_all_themes()
+            t = all_themes.get(theme_name, ThemeManager._defaults()["Xcode Dark"])
+            cached = (ThemeManager._render_css(t), t)
+            ThemeManager._css_cache[key] = cached
+
+        ThemeManager._last_key = key
+        ThemeManager._last_result = cached
+        return cached
 
 # ==========================================
 # 2. CODE EDITOR WITH AUTO-COMPLETE
@@ -484,19 +617,100 @@ class LineNumberArea(QWidget):
         self.editor.line_number_area_paint_event(event)
 
 
+class PrefixCompletionModel(QAbstractListModel):
+    """Completion candidates for a prefix, found by binary search.
+
+    Words are kept sorted by lowercased form, so set_prefix is two bisects
+    (O(log N)) exposing rows [lo, hi) — instead of QCompleter's linear
+    filter scan per keystroke as the vocabulary grows.
+    """
+
+    def __init__(self, words, parent=None):
+        super().__init__(parent)
+        self._words = sorted(words, key=str.lower)
+        self._keys = [w.lower() for w in self._words]
+        self._lo = 0
+        self._hi = len(self._words)
+
+    def set_prefix(self, prefix):
+        """Restrict visible rows to words starting with prefix. Returns match count."""
+        prefix = prefix.lower()
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + '\uffff')
+        if (lo, hi) != (self._lo, self._hi):
+            self.beginResetModel()
+            self._lo, self._hi = lo, hi
+            self.endResetModel()
+        return hi - lo
+
+    def rowCount(self, parent=QModelIndex()):
+        return self._hi - self._lo
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._words[self._lo + index.row()]
+        return None
+
+
 class CodeEditor(QPlainTextEdit):
     """Advanced code editor with line numbers and auto-complete"""
 
+    # Completion vocabulary shared by every editor instance
+    _KEYWORDS = tuple(sorted(set([
+        # Python keywords
+        "False", "None", "True", "and", "as", "assert", "async", "await",
+        "break", "class", "continue", "def", "del", "elif", "else", "except",
+        "finally", "for", "from", "global", "if", "import", "in", "is",
+        "lambda", "nonlocal", "not", "or", "pass", "raise", "return",
+        "try", "while", "with", "yield",
+        # Common functions
+        "print", "len", "range", "str", "int", "float", "list", "dict",
+        "set", "tuple", "open", "input", "type", "isinstance", "enumerate",
+        "zip", "map", "filter", "sorted", "reversed", "sum", "min", "max",
+        # Common imports
+        "numpy", "pandas", "requests", "json", "sys",
+        "os", "datetime", "math", "random", "re", "collections"
+    ])))
+    _COMPLETION_MODEL = None
+
+    # Gutter colors, hoisted so the paint loop doesn't allocate QColors
+    _LN_BG = QColor("#292a30")
+    _LN_FG = QColor("#6e6e73")
+
+    # Identifier tail before the cursor, compiled once for the
+    # per-keystroke completion check
+    _WORD_RE = QRegularExpression(r'[A-Za-z_][A-Za-z0-9_]*$')
+
+    # Characters that can continue an identifier; anything else hides
+    # the completer without touching the prefix machinery
+    _IDENT_CONT = frozenset(string.ascii_letters + string.digits + '_')
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Line numbers
+        # Line numbers. Glyph width and digit count are cached because
+        # line_number_area_width runs on every updateRequest (scroll tick)
         self.line_number_area = LineNumberArea(self)
+        self._digit_w = None
+        self._digits = 1
+        self._digit_range = (1, 10)
 
         # Auto-completion
         self.completer = None
         self.setup_completer()
 
+        # Coalescing timers: cursorPositionChanged fires per autorepeat
+        # keystroke, so batch the work to once per event-loop turn
+        self._hl_timer = QTimer(self)
+        self._hl_timer.setSingleShot(True)
+        self._hl_timer.setInterval(0)
+        self._hl_timer.timeout.connect(self._do_highlight_current_line)
+
+        self._ln_width_timer = QTimer(self)
+        self._ln_width_timer.setSingleShot(True)
+        self._ln_width_timer.setInterval(0)
+        self._ln_width_timer.timeout.connect(lambda: self.update_line_number_area_width(0))
+
         # Connect signals
         self.blockCountChanged.connect(self.update_line_number_area_width)
         self.updateRequest.connect(self.update_line_number_area)
@@ -512,24 +726,14 @@ class CodeEditor(QPlainTextEdit):
 
     def setup_completer(self):
         """Setup auto-completion"""
-        # Python keywords and common functions
-        keywords = [
-            # Python keywords
-            "False", "None", "True", "and", "as", "assert", "async", "await",
-            "break", "class", "continue", "def", "del", "elif", "else", "except",
-            "finally", "for", "from", "global", "if", "import", "in", "is",
-            "lambda", "nonlocal", "not", "or", "pass", "raise", "return",
-            "try", "while", "with", "yield",
-            # Common functions
-            "print", "len", "range", "str", "int", "float", "list", "dict",
-            "set", "tuple", "open", "input", "type", "isinstance", "enumerate",
-            "zip", "map", "filter", "sorted", "reversed", "sum", "min", "max",
-            # Common imports
-            "import", "from", "numpy", "pandas", "requests", "json", "sys",
-            "os", "datetime", "math", "random", "re", "collections"
-        ]
-
-        self.completer = QCompleter(keywords, self)
+        # One model for all editors; it pre-filters by prefix via bisect,
+        # so QCompleter never runs its own linear scan
+        if CodeEditor._COMPLETION_MODEL is None:
+            CodeEditor._COMPLETION_MODEL = PrefixCompletionModel(CodeEditor._KEYWORDS)
+
+        self._completion_prefix = ""
+        self.completer = QCompleter(self)
+        self.completer.setModel(CodeEditor._COMPLETION_MODEL)
         self.completer.setWidget(self)
         self.completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
         self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
@@ -541,17 +745,21 @@ class CodeEditor(QPlainTextEdit):
             return
 
         tc = self.textCursor()
-        extra = len(completion) - len(self.completer.completionPrefix())
+        extra = len(completion) - len(self._completion_prefix)
         tc.movePosition(QTextCursor.MoveOperation.Left)
         tc.movePosition(QTextCursor.MoveOperation.EndOfWord)
-        tc.insertText(completion[-extra:])
+        if extra > 0:
+            tc.insertText(completion[-extra:])
         self.setTextCursor(tc)
 
     def text_under_cursor(self):
         """Get text under cursor for completion"""
-        tc = self.textCursor()
-        tc.select(QTextCursor.SelectionType.WordUnderCursor)
-        return tc.selectedText()
+        # Match against the line prefix instead of building and
+        # selecting a QTextCursor on every keystroke
+        cursor = self.textCursor()
+        text = cursor.block().text()[:cursor.positionInBlock()][-64:]
+        m = self._WORD_RE.match(text)
+        return m.captured(0) if m.hasMatch() else ''
 
     def keyPressEvent(self, event):
         """Handle key press for auto-completion"""
@@ -589,6 +797,14 @@ class CodeEditor(QPlainTextEdit):
         # Regular key press
         super().keyPressEvent(event)
 
+        # Most keystrokes (arrows, space, punctuation) can't extend an
+        # identifier — bail before any prefix/model work
+        ch = event.text()
+        if not ch or ch not in self._IDENT_CONT:
+            if self.completer:
+                self.completer.popup().hide()
+            return
+
         # Trigger completion
         completion_prefix = self.text_under_cursor()
 
@@ -598,8 +814,11 @@ class CodeEditor(QPlainTextEdit):
             return
 
         if self.completer:
-            if completion_prefix != self.completer.completionPrefix():
-                self.completer.setCompletionPrefix(completion_prefix)
+            if completion_prefix != self._completion_prefix:
+                self._completion_prefix = completion_prefix
+                if not CodeEditor._COMPLETION_MODEL.set_prefix(completion_prefix):
+                    self.completer.popup().hide()
+                    return
                 self.completer.popup().setCurrentIndex(
                     self.completer.completionModel().index(0, 0)
                 )
@@ -611,11 +830,23 @@ class CodeEditor(QPlainTextEdit):
             )
             self.completer.complete(cr)
 
+    def setFont(self, font):
+        super().setFont(font)
+        self._digit_w = None  # glyph width is per-font
+
     def line_number_area_width(self):
         """Calculate line number area width"""
-        digits = len(str(max(1, self.blockCount())))
-        space = 10 + self.fontMetrics().horizontalAdvance('9') * digits
-        return space
+        if self._digit_w is None:
+            self._digit_w = self.fontMetrics().horizontalAdvance('9')
+
+        # Digit count only changes at powers of ten
+        bc = max(1, self.blockCount())
+        lo, hi = self._digit_range
+        if not lo <= bc < hi:
+            self._digits = len(str(bc))
+            self._digit_range = (10 ** (self._digits - 1), 10 ** self._digits)
+
+        return 10 + self._digit_w * self._digits
 
     def update_line_number_area_width(self, _):
         """Update line number area width"""
@@ -629,7 +860,7 @@ class CodeEditor(QPlainTextEdit):
             self.line_number_area.update(0, rect.y(), self.line_number_area.width(), rect.height())
 
         if rect.contains(self.viewport().rect()):
-            self.update_line_number_area_width(0)
+            self._ln_width_timer.start()
 
     def resizeEvent(self, event):
         """Handle resize"""
@@ -640,19 +871,24 @@ class CodeEditor(QPlainTextEdit):
     def line_number_area_paint_event(self, event):
         """Paint line numbers"""
         painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor("#292a30"))
+        painter.fillRect(event.rect(), self._LN_BG)
+        painter.setPen(self._LN_FG)
+
+        # Hoist everything invariant out of the per-line loop
+        fm_height = self.fontMetrics().height()
+        width = self.line_number_area.width() - 5
+        rect_top = event.rect().top()
+        rect_bottom = event.rect().bottom()
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
         bottom = top + self.blockBoundingRect(block).height()
 
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-                painter.setPen(QColor("#6e6e73"))
-                painter.drawText(0, int(top), self.line_number_area.width() - 5,
-                               self.fontMetrics().height(), Qt.AlignmentFlag.AlignRight, number)
+        while block.isValid() and top <= rect_bottom:
+            if block.isVisible() and bottom >= rect_top:
+                painter.drawText(0, int(top), width, fm_height,
+                               Qt.AlignmentFlag.AlignRight, str(block_number + 1))
 
             block = block.next()
             top = bottom
@@ -660,7 +896,10 @@ class CodeEditor(QPlainTextEdit):
             block_number += 1
 
     def highlight_current_line(self):
-        """Highlight current line"""
+        """Schedule a current-line highlight for this event-loop turn"""
+        self._hl_timer.start()
+
+    def _do_highlight_current_line(self):
         extra_selections = []
 
         if not self.isReadOnly():
@@ -679,51 +918,86 @@ class CodeEditor(QPlainTextEdit):
 # ==========================================
 
 class GitManager(QObject):
-    """Git integration manager"""
+    """Git integration manager (asynchronous — never blocks the GUI thread)"""
 
     status_updated = pyqtSignal(dict)
+    branch_updated = pyqtSignal(str)
     output_ready = pyqtSignal(str)
+    log_line = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
 
     def __init__(self, repo_path=None):
         super().__init__()
         self.repo_path = repo_path
+        self._procs = []  # keep QProcess objects alive until finished
+        self._last_index_mtime = None
+        self._last_branch = "HEAD"
+        self._last_status = None
 
     def set_repo_path(self, path):
         """Set repository path"""
         self.repo_path = path
+        self._last_index_mtime = None
+        self._last_status = None
 
-    def run_git_command(self, args):
-        """Run git command"""
+    def _start_git(self, args, on_output=None):
+        """Run git via QProcess; deliver stdout to on_output when it finishes"""
         if not self.repo_path:
             self.error_occurred.emit("No repository path set")
             return None
 
+        proc = QProcess(self)
+        proc.setWorkingDirectory(self.repo_path)
+        self._procs.append(proc)
+
+        def done(exit_code, _exit_status):
+            self._procs.remove(proc)
+            out = bytes(proc.readAllStandardOutput()).decode('utf-8', 'replace')
+            err = bytes(proc.readAllStandardError()).decode('utf-8', 'replace')
+            proc.deleteLater()
+            if exit_code != 0:
+                self.error_occurred.emit(err or out)
+            elif on_output is not None:
+                on_output(out)
+
+        proc.finished.connect(done)
+        proc.start('git', args)
+        return proc
+
+    def refresh(self, force=False):
+        """Refresh branch + working-tree status with a single git call"""
+        if not self.repo_path:
+            return
+
+        # Fast path: if .git/index is untouched since last time, re-emit
+        # the cached result instead of forking git again
         try:
-            result = subprocess.run(
-                ['git'] + args,
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            mtime = os.stat(os.path.join(self.repo_path, '.git', 'index')).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if (not force and mtime is not None and mtime == self._last_index_mtime
+                and self._last_status is not None):
+            self.branch_updated.emit(self._last_branch)
+            self.status_updated.emit(self._last_status)
+            return
 
-            if result.returncode == 0:
-                return result.stdout
-            else:
-                self.error_occurred.emit(result.stderr)
-                return None
+        def parse(output):
+            self._last_index_mtime = mtime
+            self._parse_refresh(output)
 
-        except Exception as e:
-            self.error_occurred.emit(str(e))
-            return None
+        self._start_git(['status', '--porcelain', '--branch'], parse)
 
-    def get_status(self):
-        """Get git status"""
-        output = self.run_git_command(['status', '--porcelain'])
-        if output is None:
-            return {}
+    # Porcelain status code -> bucket; replaces the old if/elif cascade
+    _STATUS_BUCKETS = {
+        ' M': 'modified',
+        'M ': 'modified',
+        'A ': 'added',
+        'D ': 'deleted',
+        '??': 'untracked',
+    }
 
+    def _parse_refresh(self, output):
         status = {
             'modified': [],
             'added': [],
@@ -731,78 +1005,114 @@ class GitManager(QObject):
             'untracked': []
         }
 
-        for line in output.strip().split('\n'):
+        buckets = self._STATUS_BUCKETS
+        for line in output.splitlines():
             if not line:
                 continue
 
-            status_code = line[:2]
-            filepath = line[3:]
+            if line.startswith('## '):
+                # "## main...origin/main [ahead 1]" or "## HEAD (no branch)"
+                self._last_branch = line[3:].split('...')[0]
+                continue
 
-            if status_code == ' M' or status_code == 'M ':
-                status['modified'].append(filepath)
-            elif status_code == 'A ':
-                status['added'].append(filepath)
-            elif status_code == 'D ':
-                status['deleted'].append(filepath)
-            elif status_code == '??':
-                status['untracked'].append(filepath)
+            bucket = buckets.get(line[:2])
+            if bucket:
+                status[bucket].append(line[3:])
 
+        self._last_status = status
+        self.branch_updated.emit(self._last_branch)
         self.status_updated.emit(status)
-        return status
+
+    def _stream_git(self, args, emit_line):
+        """Run git via QProcess, delivering stdout line-by-line as it arrives
+
+        Large repos produce multi-MB log/diff output; streaming lets the
+        UI show the first lines immediately and never holds the whole
+        output in one string.
+        """
+        if not self.repo_path:
+            self.error_occurred.emit("No repository path set")
+            return None
+
+        proc = QProcess(self)
+        proc.setWorkingDirectory(self.repo_path)
+        self._procs.append(proc)
+
+        def read_lines():
+            while proc.canReadLine():
+                line = bytes(proc.readLine()).decode('utf-8', 'replace')
+                emit_line(line.rstrip('\n'))
+
+        def done(exit_code, _exit_status):
+            self._procs.remove(proc)
+            read_lines()
+            tail = bytes(proc.readAllStandardOutput()).decode('utf-8', 'replace')
+            if tail:
+                emit_line(tail)
+            err = bytes(proc.readAllStandardError()).decode('utf-8', 'replace')
+            proc.deleteLater()
+            if exit_code != 0 and err:
+                self.error_occurred.emit(err)
+
+        proc.readyReadStandardOutput.connect(read_lines)
+        proc.finished.connect(done)
+        proc.start('git', args)
+        return proc
 
     def get_branch(self):
-        """Get current branch"""
-        output = self.run_git_command(['branch', '--show-current'])
-        return output.strip() if output else "unknown"
+        """Get current branch (as of the last refresh)"""
+        return self._last_branch
 
     def add_files(self, files):
         """Add files to staging"""
         if isinstance(files, str):
             files = [files]
 
-        output = self.run_git_command(['add'] + files)
-        if output is not None:
+        def done(_out):
             self.output_ready.emit(f"Added files: {', '.join(files)}")
-            self.get_status()
+            self.refresh(force=True)
+
+        self._start_git(['add'] + files, done)
 
     def commit(self, message):
         """Commit changes"""
-        output = self.run_git_command(['commit', '-m', message])
-        if output is not None:
+        def done(_out):
             self.output_ready.emit(f"Committed: {message}")
-            self.get_status()
+            self.refresh(force=True)
+
+        self._start_git(['commit', '-m', message], done)
 
     def push(self, remote='origin', branch=None):
         """Push to remote"""
         if branch is None:
-            branch = self.get_branch()
+            branch = self._last_branch  # HEAD resolves to the current branch
 
-        output = self.run_git_command(['push', remote, branch])
-        if output is not None:
-            self.output_ready.emit(f"Pushed to {remote}/{branch}")
+        self._start_git(['push', remote, branch],
+                        lambda _out: self.output_ready.emit(f"Pushed to {remote}/{branch}"))
 
     def pull(self, remote='origin', branch=None):
         """Pull from remote"""
         if branch is None:
-            branch = self.get_branch()
+            branch = self._last_branch
 
-        output = self.run_git_command(['pull', remote, branch])
-        if output is not None:
+        def done(_out):
             self.output_ready.emit(f"Pulled from {remote}/{branch}")
-            self.get_status()
+            self.refresh(force=True)
+
+        self._start_git(['pull', remote, branch], done)
 
-    def get_diff(self, filepath=None):
-        """Get diff"""
+    def stream_diff(self, filepath=None):
+        """Stream diff to the console line-by-line"""
         args = ['diff']
         if filepath:
             args.append(filepath)
 
-        return self.run_git_command(args)
+        self._stream_git(args, self.output_ready.emit)
 
-    def get_log(self, count=10):
-        """Get commit log"""
-        output = self.run_git_command(['log', f'-{count}', '--oneline'])
-        return output if output else ""
+    def stream_log(self, count=10):
+        """Stream commit log line-by-line"""
+        self._stream_git(['log', f'-{count}', '--oneline'],
+                         self.log_line.emit)
 
 # ==========================================
 # 4. PYTHON DEBUGGER
@@ -820,6 +1130,15 @@ class PythonDebugger(QObject):
         self.process = None
         self.breakpoints = set()
 
+        # Output buffering: verbose programs produce a flood of small
+        # chunks, and a decode + signal + repaint per chunk is the
+        # bottleneck. Buffer raw bytes and flush at most every 16ms.
+        self._out_buf = bytearray()
+        self._err_buf = bytearray()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(16)
+        self._flush_timer.timeout.connect(self._flush_buffers)
+
     def add_breakpoint(self, line):
         """Add breakpoint"""
         self.breakpoints.add(line)
@@ -860,22 +1179,31 @@ class PythonDebugger(QObject):
     def debug_code(self, code, filepath=None):
         """Debug code with pdb"""
         try:
-            # Insert pdb breakpoints
-            lines = code.split('\n')
-            for bp in sorted(self.breakpoints, reverse=True):
-                if 0 < bp <= len(lines):
-                    lines.insert(bp - 1, "import pdb; pdb.set_trace()")
-
-            code_with_bp = '\n'.join(lines)
-
-            # Save and run
+            # Make sure the source exists on disk; breakpoints target the
+            # real file so tracebacks keep meaningful paths/line numbers
+            # (no more splicing set_trace lines into a copy of the source)
             if filepath is None:
                 with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                    f.write(code_with_bp)
+                    f.write(code)
                     filepath = f.name
 
+            driver = (
+                "import pdb\n"
+                f"target = {filepath!r}\n"
+                "p = pdb.Pdb()\n"
+                f"for ln in {sorted(self.breakpoints)!r}:\n"
+                "    p.set_break(target, ln)\n"
+                "with open(target) as f:\n"
+                "    src = f.read()\n"
+                "p.run(compile(src, target, 'exec'))\n"
+            )
+
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                f.write(driver)
+                driver_path = f.name
+
             self.output_ready.emit(f"Debugging {filepath}...")
-            self.run_code(code_with_bp, filepath)
+            self.run_code(driver, driver_path)
 
         except Exception as e:
             self.error_occurred.emit(f"Failed to debug: {e}")
@@ -889,17 +1217,30 @@ class PythonDebugger(QObject):
     def _handle_stdout(self):
         """Handle stdout"""
         if self.process:
-            data = self.process.readAllStandardOutput().data().decode()
-            self.output_ready.emit(data)
+            self._out_buf += self.process.readAllStandardOutput().data()
+            if not self._flush_timer.isActive():
+                self._flush_timer.start()
 
     def _handle_stderr(self):
         """Handle stderr"""
         if self.process:
-            data = self.process.readAllStandardError().data().decode()
-            self.error_occurred.emit(data)
+            self._err_buf += self.process.readAllStandardError().data()
+            if not self._flush_timer.isActive():
+                self._flush_timer.start()
+
+    def _flush_buffers(self):
+        """Decode and emit buffered output — one GUI update per interval"""
+        if self._out_buf:
+            self.output_ready.emit(self._out_buf.decode('utf-8', 'replace'))
+            self._out_buf.clear()
+        if self._err_buf:
+            self.error_occurred.emit(self._err_buf.decode('utf-8', 'replace'))
+            self._err_buf.clear()
+        self._flush_timer.stop()
 
     def _handle_finished(self, exit_code, exit_status):
         """Handle process finished"""
+        self._flush_buffers()  # drain whatever the last interval left
         if exit_code == 0:
             self.output_ready.emit("\n✅ Execution completed successfully")
         else:
@@ -922,26 +1263,50 @@ class LanguageDetector:
         "Dart": {"exts": [".dart"], "lexer": "dart"}
     }
 
-    @staticmethod
-    def detect(filename):
+    # Reverse indexes for O(1) dispatch; detect runs on every file open
+    # and language change
+    _EXT_INDEX = {ext: lang
+                  for lang, info in LANGUAGES.items()
+                  for ext in info["exts"]}
+    _LEXER_INDEX = {lang: info["lexer"] for lang, info in LANGUAGES.items()}
+
+    @classmethod
+    def detect(cls, filename):
         ext = os.path.splitext(filename)[1].lower()
-        for lang, info in LanguageDetector.LANGUAGES.items():
-            if ext in info["exts"]:
-                return lang
-        return "Text"
+        return cls._EXT_INDEX.get(ext, "Text")
 
-    @staticmethod
-    def get_lexer_name(lang):
-        return LanguageDetector.LANGUAGES.get(lang, {}).get("lexer", "text")
+    @classmethod
+    def get_lexer_name(cls, lang):
+        return cls._LEXER_INDEX.get(lang, "text")
 
 class ConfigManager:
-    @staticmethod
-    def get_key(provider_type):
+    # Resolved keys; each get_key miss opens the QSettings backend
+    # (registry/plist/INI), so cache and invalidate on settings save
+    _cache = {}
+    _settings = None
+
+    @classmethod
+    def get_key(cls, provider_type):
+        key = cls._cache.get(provider_type)
+        if key is not None:
+            return key
+
         key = os.getenv(f"{provider_type.upper()}_API_KEY")
         if not key:
-            key = QSettings("GenAI_Studio", "SecureKeys").value(provider_type, "")
+            if cls._settings is None:
+                cls._settings = QSettings("GenAI_Studio", "SecureKeys")
+            key = cls._settings.value(provider_type, "")
+        cls._cache[provider_type] = key
         return key
 
+    @classmethod
+    def invalidate(cls, provider_type=None):
+        """Drop cached keys after the settings dialog saves"""
+        if provider_type is None:
+            cls._cache.clear()
+        else:
+            cls._cache.pop(provider_type, None)
+
 class AIProviderFactory:
     MODELS = {
         "Gemini 2.0 Flash": {"type": "gemini", "model": "gemini-2.0-flash-exp"},
@@ -949,6 +1314,12 @@ class AIProviderFactory:
         "Claude 3.5 Sonnet": {"type": "anthropic", "model": "claude-3-5-sonnet-latest"}
     }
 
+    # Clients keyed by (provider, key digest): construction opens TLS
+    # connection pools, so share one per credential and reuse its
+    # connections across requests. The digest keeps raw keys out of the
+    # cache keys.
+    _CLIENTS = {}
+
     @staticmethod
     def create(config_name):
         conf = AIProviderFactory.MODELS.get(config_name)
@@ -961,15 +1332,59 @@ class AIProviderFactory:
         if not api_key:
             raise ValueError(f"Missing API Key for {p_type}")
 
-        if p_type == "gemini":
-            genai.configure(api_key=api_key)
-            return genai.GenerativeModel(conf["model"])
-        elif p_type == "openai":
-            return OpenAI(api_key=api_key)
-        elif p_type == "anthropic":
-            return Anthropic(api_key=api_key)
+        key_digest = hashlib.blake2b(api_key.encode(),
+                                     digest_size=8).hexdigest()
+        cache_key = (config_name, key_digest)
+        client = AIProviderFactory._CLIENTS.get(cache_key)
+        if client is not None:
+            return client
+
+        client = AIProviderFactory._FACTORIES[p_type](conf["model"], api_key)
+
+        AIProviderFactory._CLIENTS[cache_key] = client
+        return client
+
+    @staticmethod
+    def _make_gemini(model, api_key):
+        genai.configure(api_key=api_key)
+        return genai.GenerativeModel(model)
+
+    @staticmethod
+    def _make_openai(model, api_key):
+        return OpenAI(api_key=api_key)
+
+    @staticmethod
+    def _make_anthropic(model, api_key):
+        return Anthropic(api_key=api_key)
+
+    @classmethod
+    def invalidate(cls):
+        """Drop cached clients after credentials change"""
+        cls._CLIENTS.clear()
+
+
+# Provider-type dispatch; new providers register a factory and a runner
+# instead of growing if/elif chains in two places
+AIProviderFactory._FACTORIES = {
+    "gemini": AIProviderFactory._make_gemini,
+    "openai": AIProviderFactory._make_openai,
+    "anthropic": AIProviderFactory._make_anthropic,
+}
+
+
+class _Cancelled(Exception):
+    """Raised inside a worker when its request has been superseded"""
 
-class RefactorWorker(QThread):
+
+class RefactorWorker(QObject):
+    """Streams a refactor response; run on the IDE's shared pool.
+
+    Signal emission is queued across threads by Qt, so chunks land on
+    the GUI thread as they arrive — the first delta shows after one
+    network round-trip instead of after the full completion.
+    """
+
+    chunk = pyqtSignal(str)
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
@@ -978,6 +1393,41 @@ class RefactorWorker(QThread):
         self.model_name = model_name
         self.code = code
         self.lang = lang
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop this request; checked between streamed chunks"""
+        self.cancelled = True
+
+    def _emit_chunk(self, text, parts):
+        if self.cancelled:
+            raise _Cancelled()
+        if text:
+            parts.append(text)
+            self.chunk.emit(text)
+
+    def _run_gemini(self, backend, model, prompt, parts):
+        resp = backend.generate_content(prompt, stream=True)
+        for part in resp:
+            self._emit_chunk(part.text, parts)
+
+    def _run_openai(self, backend, model, prompt, parts):
+        stream = backend.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        for event in stream:
+            self._emit_chunk(event.choices[0].delta.content, parts)
+
+    def _run_anthropic(self, backend, model, prompt, parts):
+        with backend.messages.stream(
+            model=model,
+            max_tokens=8192,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for delta in stream.text_stream:
+                self._emit_chunk(delta, parts)
 
     def run(self):
         try:
@@ -995,62 +1445,333 @@ Provide:
 2. Complete refactored code
 3. Key improvements"""
 
-            if conf["type"] == "gemini":
-                resp = backend.generate_content(prompt)
-                self.finished.emit(resp.text)
-            elif conf["type"] == "openai":
-                resp = backend.chat.completions.create(
-                    model=conf["model"],
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                self.finished.emit(resp.choices[0].message.content)
-            elif conf["type"] == "anthropic":
-                msg = backend.messages.create(
-                    model=conf["model"],
-                    max_tokens=8192,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                self.finished.emit(msg.content[0].text)
+            parts = []
+            self._RUNNERS[conf["type"]](self, backend, conf["model"],
+                                        prompt, parts)
+
+            self.finished.emit("".join(parts))
+        except _Cancelled:
+            pass
         except Exception as e:
-            self.error.emit(str(e))
+            if not self.cancelled:
+                self.error.emit(str(e))
+
+
+RefactorWorker._RUNNERS = {
+    "gemini": RefactorWorker._run_gemini,
+    "openai": RefactorWorker._run_openai,
+    "anthropic": RefactorWorker._run_anthropic,
+}
 
 # ==========================================
 # 6. SYNTAX HIGHLIGHTER
 # ==========================================
 
+# Pygments rebuilds its lookup tables on every get_lexer_by_name /
+# get_style_by_name call; memoized here so repeated highlighter
+# construction (language/theme switches) is a dict hit
+@functools.lru_cache(maxsize=32)
+def _get_lexer(name):
+    try:
+        return lexers.get_lexer_by_name(name)
+    except:
+        return lexers.get_lexer_by_name("text")
+
+
+@functools.lru_cache(maxsize=8)
+def _get_style(name):
+    try:
+        return styles.get_style_by_name(name)
+    except:
+        return styles.get_style_by_name("monokai")
+
+
 class PygmentsHighlighter(QSyntaxHighlighter):
-    def __init__(self, document, lexer_name='python', style='monokai'):
+    # Blocks this far outside the viewport are deferred to the catch-up
+    # timer instead of being highlighted inline
+    _VIEW_MARGIN = 100
+
+    def __init__(self, document, lexer_name='python', style='monokai',
+                 editor=None):
         super().__init__(document)
-        try:
-            self._lexer = lexers.get_lexer_by_name(lexer_name)
-        except:
-            self._lexer = lexers.get_lexer_by_name("text")
+        self._lexer_name = lexer_name
+        self._style_name = style
+        self._set_lexer(lexer_name)
+        self._set_style(style)
+        # With an editor attached, full-document passes (file load,
+        # rehighlight) only pay for blocks near the viewport; the rest
+        # queue up and drain in 16ms slices so typing stays responsive
+        # regardless of file size
+        self._editor = editor
+        self._pending = set()
+        self._heap = []  # pending block numbers, min-heap for the sweep
+        self._catching_up = False
+        self._catchup_timer = QTimer(self)
+        self._catchup_timer.setInterval(16)
+        self._catchup_timer.timeout.connect(self._drain_pending)
+
+    def _defer_if_offscreen(self, block):
+        """Queue far-offscreen blocks for the catch-up timer"""
+        editor = self._editor
+        if editor is None or self._catching_up:
+            return False
+
+        n = block.blockNumber()
+        first = editor.firstVisibleBlock().blockNumber()
+        visible = (editor.viewport().height()
+                   // max(1, editor.fontMetrics().lineSpacing()))
+        if first - self._VIEW_MARGIN <= n <= first + visible + self._VIEW_MARGIN:
+            return False
+
+        if n not in self._pending:
+            self._pending.add(n)
+            heapq.heappush(self._heap, n)
+        if not self._catchup_timer.isActive():
+            self._catchup_timer.start()
+        return True
+
+    def _highlight_pending(self, n, doc):
+        self._pending.discard(n)
+        block = doc.findBlockByNumber(n)
+        if block.isValid():
+            self.rehighlightBlock(block)
+            return True
+        return False
+
+    def _drain_pending(self):
+        """Highlight a slice of deferred blocks each tick.
+
+        Blocks near the current viewport go first, so jumping to the
+        end of a big file styles what's on screen within a tick or two
+        (the incremental lexer falls back to the root stack there, as it
+        does for any block with no resolved predecessor). The remainder
+        drains lowest-numbered first via a min-heap — heappop per block
+        instead of re-sorting the whole pending set every 16ms.
+        """
+        if not self._pending:
+            self._catchup_timer.stop()
+            return
 
+        doc = self.document()
+        editor = self._editor
+        budget = 64
+        self._catching_up = True
         try:
-            self._style = styles.get_style_by_name(style)
-        except:
-            self._style = styles.get_style_by_name("monokai")
+            if editor is not None:
+                first = editor.firstVisibleBlock().blockNumber()
+                visible = (editor.viewport().height()
+                           // max(1, editor.fontMetrics().lineSpacing()))
+                lo = max(0, first - self._VIEW_MARGIN)
+                hi = first + visible + self._VIEW_MARGIN
+                for n in range(lo, hi + 1):
+                    if not budget:
+                        break
+                    if n in self._pending and self._highlight_pending(n, doc):
+                        budget -= 1
+
+            heap = self._heap
+            while budget and heap:
+                n = heapq.heappop(heap)
+                if n not in self._pending:
+                    continue  # already done in the viewport sweep
+                if self._highlight_pending(n, doc):
+                    budget -= 1
+        finally:
+            self._catching_up = False
+
+        if not self._pending:
+            self._heap.clear()
+            self._catchup_timer.stop()
+
+    def _set_lexer(self, lexer_name):
+        self._lexer = _get_lexer(lexer_name)
+        # Incremental lexing carries the lexer state stack across block
+        # boundaries via Qt block states: _state_table maps the integer
+        # block state back to a stack snapshot, _state_ids dedupes.
+        # ExtendedRegexLexer subclasses thread their own context object,
+        # so only plain RegexLexers take the stateful path.
+        self._incremental = (isinstance(self._lexer, RegexLexer)
+                             and not isinstance(self._lexer, ExtendedRegexLexer))
+        self._state_table = [('root',)]
+        self._state_ids = {('root',): 0}
+
+    def _set_style(self, style):
+        self._style = _get_style(style)
+        # Formats for every token type the style defines, built once up
+        # front; highlightBlock never parses a color string or allocates
+        # a QTextCharFormat
+        self._fmt_table = {}
+        for token_type, tstyle in self._style:
+            fmt = QTextCharFormat()
+            if tstyle['color']:
+                fmt.setForeground(QColor('#' + tstyle['color']))
+            if tstyle['bold']:
+                fmt.setFontWeight(QFont.Weight.Bold)
+            self._fmt_table[token_type] = fmt
+
+    def set_language(self, lexer_name, style):
+        """Swap lexer and/or style in place.
+
+        Replacing the whole highlighter detaches and reattaches a
+        QSyntaxHighlighter, which rehighlights the entire document each
+        time; mutating in place pays one rehighlight, and none when
+        nothing changed.
+        """
+        changed = False
+        if lexer_name != self._lexer_name:
+            self._lexer_name = lexer_name
+            self._set_lexer(lexer_name)
+            changed = True
+        if style != self._style_name:
+            self._style_name = style
+            self._set_style(style)
+            changed = True
+        if changed:
+            self.rehighlight()
+
+    def _lex_line(self, text, stack):
+        """Run one line through the lexer's token tables.
+
+        pygments' get_tokens_unprocessed keeps its state stack local, so
+        an incremental highlighter has to drive the tables itself; this
+        mirrors that loop but returns the end-of-line stack so it can be
+        stored in the block state. The per-line token list stays small
+        and is the price of knowing the final stack up front.
+        """
+        lexer = self._lexer
+        tokendefs = lexer._tokens
+        statestack = list(stack)
+        statetokens = tokendefs[statestack[-1]]
+        tokens = []
+        pos = 0
+        end = len(text)
+
+        while pos < end:
+            for rexmatch, action, new_state in statetokens:
+                m = rexmatch(text, pos)
+                if m:
+                    if action is not None:
+                        if callable(action):
+                            tokens.extend(action(lexer, m))
+                        else:
+                            tokens.append((pos, action, m.group()))
+                    pos = m.end()
+                    if new_state is not None:
+                        if isinstance(new_state, tuple):
+                            for state in new_state:
+                                if state == '#pop':
+                                    if len(statestack) > 1:
+                                        statestack.pop()
+                                elif state == '#push':
+                                    statestack.append(statestack[-1])
+                                else:
+                                    statestack.append(state)
+                        elif isinstance(new_state, int):
+                            # pop n states, but never empty the stack
+                            if abs(new_state) >= len(statestack):
+                                del statestack[1:]
+                            else:
+                                del statestack[new_state:]
+                        elif new_state == '#push':
+                            statestack.append(statestack[-1])
+                        statetokens = tokendefs[statestack[-1]]
+                    break
+            else:
+                if text[pos] == '\n':
+                    statestack = ['root']
+                    statetokens = tokendefs['root']
+                    pos += 1
+                    continue
+                tokens.append((pos, token.Error, text[pos]))
+                pos += 1
+
+        return tokens, tuple(statestack)
+
+    def _resolve_fmt(self, token_type):
+        """Resolve a token type the style doesn't list directly.
+
+        Walks the parent chain the way style_for_token does, then caches
+        the result so the walk happens once per token type.
+        """
+        table = self._fmt_table
+        fmt = None
+        parent = token_type.parent
+        while parent is not None and fmt is None:
+            fmt = table.get(parent)
+            parent = parent.parent
+        if fmt is None:
+            fmt = QTextCharFormat()
+        table[token_type] = fmt
+        return fmt
+
+    def _set_formats(self, spans):
+        """Apply (start, length, fmt) spans, coalescing adjacent runs.
+
+        Formats come from the shared table, so an identity compare is
+        enough; whitespace/operator-heavy lines collapse to a few
+        setFormat calls instead of one per token.
+        """
+        run_start = 0
+        run_len = 0
+        run_fmt = None
+        for start, length, fmt in spans:
+            if fmt is run_fmt and start == run_start + run_len:
+                run_len += length
+            else:
+                if run_len:
+                    self.setFormat(run_start, run_len, run_fmt)
+                run_start, run_len, run_fmt = start, length, fmt
+        if run_len:
+            self.setFormat(run_start, run_len, run_fmt)
 
     def highlightBlock(self, text):
         try:
-            tokens = list(pygments.lex(text, self._lexer))
-            index = 0
+            if self._defer_if_offscreen(self.currentBlock()):
+                return
 
-            for token_type, value in tokens:
-                text_fmt = QTextCharFormat()
+            fmt_table = self._fmt_table
 
-                try:
-                    style = self._style.style_for_token(token_type)
-                    if style['color']:
-                        text_fmt.setForeground(QColor(f"#{style['color']}"))
-                    if style.get('bold'):
-                        text_fmt.setFontWeight(QFont.Weight.Bold)
-
-                    length = len(value)
-                    self.setFormat(index, length, text_fmt)
-                    index += length
-                except:
-                    index += len(value)
+            if not self._incremental:
+                def spans():
+                    index = 0
+                    for token_type, value in pygments.lex(text, self._lexer):
+                        fmt = fmt_table.get(token_type)
+                        if fmt is None:
+                            fmt = self._resolve_fmt(token_type)
+                        length = len(value)
+                        yield index, length, fmt
+                        index += length
+
+                self._set_formats(spans())
+                return
+
+            prev = self.previousBlockState()
+            if 0 <= prev < len(self._state_table):
+                stack = self._state_table[prev]
+            else:
+                stack = ('root',)
+
+            # Lex with the trailing newline pygments patterns expect;
+            # Qt clamps formats past the block's real length
+            tokens, end_stack = self._lex_line(text + '\n', stack)
+
+            def spans():
+                for index, token_type, value in tokens:
+                    fmt = fmt_table.get(token_type)
+                    if fmt is None:
+                        fmt = self._resolve_fmt(token_type)
+                    yield index, len(value), fmt
+
+            self._set_formats(spans())
+
+            # Qt only re-highlights downstream blocks when this changes,
+            # so e.g. closing a docstring relexes only the affected span
+            state_id = self._state_ids.get(end_stack)
+            if state_id is None:
+                state_id = len(self._state_table)
+                self._state_ids[end_stack] = state_id
+                self._state_table.append(end_stack)
+            self.setCurrentBlockState(state_id)
         except:
             pass
 
@@ -1066,7 +1787,8 @@ class ThemeEditorDialog(QDialog):
         self.setWindowTitle("Theme Editor")
         self.resize(600, 700)
 
-        self.theme_data = dict(base_theme) if base_theme else dict(ThemeManager.DEFAULT_THEMES["Xcode Dark"])
+        base = base_theme or ThemeManager._defaults()["Xcode Dark"]
+        self.theme_data = base._asdict()
 
         self.init_ui()
 
@@ -1077,7 +1799,7 @@ class ThemeEditorDialog(QDialog):
         name_layout = QHBoxLayout()
         name_layout.addWidget(QLabel("Theme Name:"))
         self.name_input = QLineEdit()
-        self.name_input.setText(self.theme_data.get("name", "My Custom Theme"))
+        self.name_input.setText(self.theme_data.get("name") or "My Custom Theme")
         name_layout.addWidget(self.name_input)
         layout.addLayout(name_layout)
 
@@ -1164,6 +1886,18 @@ class FullFeatureIDE(QMainWindow):
         self.git_manager = GitManager()
         self.debugger = PythonDebugger()
 
+        # One small pool for refactor requests instead of a QThread per
+        # click; the worker streams chunks back via queued signals
+        self._refactor_pool = ThreadPoolExecutor(max_workers=2)
+        self.worker = None
+        self._result_editor = None
+
+        # Debounces the per-keystroke char-count status update
+        self._count_timer = QTimer(self)
+        self._count_timer.setSingleShot(True)
+        self._count_timer.setInterval(80)
+        self._count_timer.timeout.connect(self._do_count_update)
+
         self.setup_ui()
         self.apply_theme()
         self.connect_signals()
@@ -1217,12 +1951,10 @@ class FullFeatureIDE(QMainWindow):
 
         # Theme menu
         btn_theme = QPushButton("🎨")
-        theme_menu = QMenu()
-        for theme_name in ThemeManager.get_all_themes().keys():
-            theme_menu.addAction(theme_name, lambda t=theme_name: self.switch_theme(t))
-        theme_menu.addSeparator()
-        theme_menu.addAction("Create Custom Theme...", self.create_custom_theme)
-        btn_theme.setMenu(theme_menu)
+        self.theme_menu = QMenu()
+        self._theme_names_cached = None
+        self._rebuild_theme_menu()
+        btn_theme.setMenu(self.theme_menu)
         self.toolbar.addWidget(btn_theme)
 
         btn_settings = QPushButton("⚙️")
@@ -1273,6 +2005,9 @@ class FullFeatureIDE(QMainWindow):
         self.git_status_label = QLabel("No Git")
         self.status_bar.addPermanentWidget(self.git_status_label)
 
+        self.line_count = QLabel("1 lines")
+        self.status_bar.addPermanentWidget(self.line_count)
+
         self.char_count = QLabel("0 chars")
         self.status_bar.addPermanentWidget(self.char_count)
 
@@ -1290,11 +2025,15 @@ class FullFeatureIDE(QMainWindow):
         nav_layout.addWidget(nav_header)
 
         self.fs_model = QFileSystemModel()
-        self.fs_model.setRootPath(QDir.homePath())
+        # No filesystem watchers, and the root stays unset until a
+        # folder is opened so the home directory isn't statted at
+        # startup
+        self.fs_model.setOption(
+            QFileSystemModel.Option.DontWatchForChanges, True)
 
         self.tree = QTreeView()
         self.tree.setModel(self.fs_model)
-        self.tree.setRootIndex(self.fs_model.index(QDir.homePath()))
+        self.tree.setUniformRowHeights(True)
         self.tree.setHeaderHidden(True)
 
         for i in range(1, 4):
@@ -1429,6 +2168,8 @@ class FullFeatureIDE(QMainWindow):
         """Connect all signals"""
         # Git
         self.git_manager.status_updated.connect(self.update_git_status)
+        self.git_manager.branch_updated.connect(self.update_git_branch)
+        self.git_manager.log_line.connect(self.append_git_log)
         self.git_manager.output_ready.connect(self.append_console)
         self.git_manager.error_occurred.connect(self.append_console_error)
 
@@ -1469,25 +2210,54 @@ class FullFeatureIDE(QMainWindow):
             dialog = ThemeEditorDialog(self, base_data)
 
             if dialog.exec() == QDialog.DialogCode.Accepted:
-                # Refresh theme menu
+                self._rebuild_theme_menu()
                 self.status_label.setText("Custom theme created!")
 
+    def _rebuild_theme_menu(self):
+        """(Re)populate the theme menu; skipped when names are unchanged"""
+        names = list(ThemeManager.get_all_themes().keys())
+        if names == self._theme_names_cached:
+            return
+        self._theme_names_cached = names
+
+        self.theme_menu.clear()
+        for theme_name in names:
+            self.theme_menu.addAction(
+                theme_name, lambda t=theme_name: self.switch_theme(t))
+        self.theme_menu.addSeparator()
+        self.theme_menu.addAction("Create Custom Theme...",
+                                  self.create_custom_theme)
+
     def on_language_changed(self):
         """Handle language change"""
         lang = self.lang_combo.currentText()
+
+        if lang == "Text":
+            # Plain text needs no lexing at all; detach rather than run
+            # the TextLexer over every block for one Token.Text apiece
+            if getattr(self, 'highlighter', None) is not None:
+                self.highlighter.setDocument(None)
+                self.highlighter = None
+            return
+
         lexer = LanguageDetector.get_lexer_name(lang)
 
         _, theme = ThemeManager.get_stylesheet(self.current_theme)
-        self.highlighter = PygmentsHighlighter(
-            self.editor.document(),
-            lexer,
-            theme['pygment']
-        )
+        if getattr(self, 'highlighter', None) is not None:
+            self.highlighter.set_language(lexer, theme.pygment)
+        else:
+            self.highlighter = PygmentsHighlighter(
+                self.editor.document(),
+                lexer,
+                theme.pygment,
+                editor=self.editor
+            )
 
     def select_folder(self):
         """Select folder"""
         folder = QFileDialog.getExistingDirectory(self, "Open Folder")
         if folder:
+            self.fs_model.setRootPath(folder)
             self.tree.setRootIndex(self.fs_model.index(folder))
             self.current_repo_path = folder
             self.git_manager.set_repo_path(folder)
@@ -1499,10 +2269,27 @@ class FullFeatureIDE(QMainWindow):
 
         if os.path.isfile(path):
             try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                self.editor.setPlainText(content)
+                # mmap + one decode: text-mode read() goes through the
+                # incremental codec and line handling, copying multi-MB
+                # files several times over
+                with open(path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        content = ""
+                    else:
+                        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        content = mm[:].decode('utf-8', 'ignore')
+                        mm.close()
+
+                # No undo step for the load, and no intermediate
+                # repaints while the document is replaced
+                doc = self.editor.document()
+                doc.setUndoRedoEnabled(False)
+                self.editor.setUpdatesEnabled(False)
+                try:
+                    self.editor.setPlainText(content)
+                finally:
+                    self.editor.setUpdatesEnabled(True)
+                    doc.setUndoRedoEnabled(True)
                 self.current_file = path
 
                 filename = os.path.basename(path)
@@ -1525,8 +2312,17 @@ class FullFeatureIDE(QMainWindow):
 
     def on_text_changed(self):
         """Handle text change"""
-        count = len(self.editor.toPlainText())
+        # Restarting the timer coalesces a typing burst into one update
+        self._count_timer.start()
+
+    def _do_count_update(self):
+        # characterCount()/blockCount() are O(1); toPlainText() copied
+        # the whole document per keystroke. -1 discounts the final
+        # paragraph mark.
+        doc = self.editor.document()
+        count = doc.characterCount() - 1
         self.char_count.setText(f"{count:,} chars")
+        self.line_count.setText(f"{doc.blockCount():,} lines")
 
     def run_code(self):
         """Run code"""
@@ -1557,19 +2353,48 @@ class FullFeatureIDE(QMainWindow):
         model = self.model_combo.currentText()
         lang = self.lang_combo.currentText()
 
+        # Supersede any in-flight request: cancel and disconnect it, so
+        # deltas already queued across threads can't land in the new
+        # request's tab
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                self.worker.chunk.disconnect(self.on_refactor_chunk)
+                self.worker.finished.disconnect(self.on_refactor_success)
+                self.worker.error.disconnect(self.on_refactor_error)
+            except TypeError:
+                pass  # already fully delivered and disconnected
+        self._result_editor = None
+
         self.worker = RefactorWorker(model, code, lang)
+        self.worker.chunk.connect(self.on_refactor_chunk)
         self.worker.finished.connect(self.on_refactor_success)
         self.worker.error.connect(self.on_refactor_error)
-        self.worker.start()
+        self._refactor_pool.submit(self.worker.run)
+
+    def _ensure_result_tab(self):
+        """Create the result tab on first output, not per click"""
+        if self._result_editor is None:
+            self._result_editor = QTextEdit()
+            self._result_editor.setReadOnly(True)
+            self.editor_tabs.addTab(self._result_editor, "✨ Refactored")
+            self.editor_tabs.setCurrentWidget(self._result_editor)
+        return self._result_editor
+
+    def on_refactor_chunk(self, delta):
+        """Append a streamed delta to the result tab"""
+        self._ensure_result_tab().insertPlainText(delta)
 
     def on_refactor_success(self, result):
         """Handle refactor success"""
-        result_editor = QTextEdit()
-        result_editor.setReadOnly(True)
-        result_editor.setMarkdown(result)
-
-        self.editor_tabs.addTab(result_editor, "✨ Refactored")
-        self.editor_tabs.setCurrentWidget(result_editor)
+        # Replace the streamed plain text with the rendered markdown;
+        # suppress repaints while the whole document is swapped
+        editor = self._ensure_result_tab()
+        editor.setUpdatesEnabled(False)
+        try:
+            editor.setMarkdown(result)
+        finally:
+            editor.setUpdatesEnabled(True)
 
         self.btn_refactor.setEnabled(True)
         self.btn_refactor.setText("✨ Refactor")
@@ -1577,6 +2402,13 @@ class FullFeatureIDE(QMainWindow):
 
     def on_refactor_error(self, error):
         """Handle refactor error"""
+        # Don't leave a half-streamed orphan tab behind
+        if self._result_editor is not None:
+            idx = self.editor_tabs.indexOf(self._result_editor)
+            if idx >= 0:
+                self.editor_tabs.removeTab(idx)
+            self._result_editor = None
+
         self.btn_refactor.setEnabled(True)
         self.btn_refactor.setText("✨ Refactor")
         self.status_label.setText(f"❌ Error: {error}")
@@ -1603,14 +2435,22 @@ class FullFeatureIDE(QMainWindow):
         if not self.current_repo_path:
             return
 
-        branch = self.git_manager.get_branch()
-        self.git_branch_label.setText(f"Branch: {branch}")
-        self.git_status_label.setText(f"Git: {branch}")
+        # Both of these start QProcesses and return immediately, so the
+        # status/branch query and the log run concurrently; total refresh
+        # latency is the slower of the two, not the sum
+        self.git_manager.refresh(force=True)
+
+        self.git_log_text.clear()
+        self.git_manager.stream_log()
 
-        self.git_manager.get_status()
+    def append_git_log(self, line):
+        """Append a streamed commit line to the log panel"""
+        self.git_log_text.append(line)
 
-        log = self.git_manager.get_log()
-        self.git_log_text.setPlainText(log)
+    def update_git_branch(self, branch):
+        """Update branch labels"""
+        self.git_branch_label.setText(f"Branch: {branch}")
+        self.git_status_label.setText(f"Git: {branch}")
 
     def update_git_status(self, status):
         """Update Git status display"""
@@ -1676,6 +2516,8 @@ class FullFeatureIDE(QMainWindow):
             for k, v in inputs.items():
                 if v.text().strip():
                     settings.setValue(k, v.text().strip())
+                    ConfigManager.invalidate(k)
+            AIProviderFactory.invalidate()
             dlg.accept()
             self.status_label.setText("✅ Settings saved")
 